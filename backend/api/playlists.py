@@ -133,8 +133,8 @@ async def create_playlist(
     # 新規作成
     new_playlist = Playlist(name=playlist_data.name)
     db.add(new_playlist)
+    # expire_on_commit=False のため、commit 後も refresh せずに id を参照できる
     await db.commit()
-    await db.refresh(new_playlist)
 
     return PlaylistModel(id=new_playlist.id, name=new_playlist.name, tracks=[])
 
@@ -4,8 +4,10 @@ import subprocess
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import Response
 from pydantic import BaseModel
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
@@ -86,6 +88,27 @@ async def update_setting(setting: SettingModel, db: AsyncSession = Depends(get_d
     return {"status": "ok", "key": setting.key, "value": setting.value}
 
 
+@router.put("/bulk")
+async def bulk_update_settings(
+    settings: List[SettingModel], db: AsyncSession = Depends(get_db)
+):
+    """複数の設定を INSERT ... ON CONFLICT DO UPDATE の1文でまとめて保存"""
+    # 同一キーが複数含まれる場合は後勝ち
+    values = {s.key: s.value for s in settings}
+    if not values:
+        return {"status": "ok", "updated_count": 0}
+
+    stmt = sqlite_insert(Setting).values(
+        [{"key": key, "value": value} for key, value in values.items()]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Setting.key], set_={"value": stmt.excluded.value}
+    )
+    await db.execute(stmt)
+    await db.commit()
+    return {"status": "ok", "updated_count": len(values)}
+
+
 @router.get("/ssh-key/public")
 async def get_public_key(db: AsyncSession = Depends(get_db)):
     """保存されている公開鍵を取得（存在しない場合は生成）"""
@@ -110,7 +133,9 @@ async def get_public_key(db: AsyncSession = Depends(get_db)):
             logger.info(
                 f"SSH key pair not found, generating new one with comment: {comment}"
             )
-            generate_ssh_key_pair(comment)
+            # ssh-keygenはブロッキング処理のため、
+            # イベントループを塞がないようスレッドプールで実行する
+            await run_in_threadpool(generate_ssh_key_pair, comment)
 
             # 鍵パスをデータベースに保存
             result = await db.execute(
@@ -2,12 +2,13 @@ import datetime
 import json
 import logging
 import os
-from typing import List, Optional
+from typing import FrozenSet, List, Optional
 
 from fastapi.concurrency import run_in_threadpool
 from mutagen.easyid3 import EasyID3
 from mutagen.id3 import ID3NoHeaderError
 from mutagen.mp4 import MP4
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
@@ -16,20 +17,74 @@ from ..db.models import Setting, Track
 
 logger = logging.getLogger(__name__)
 
+# missing フラグを一括更新する際の1文あたりのID数
+MISSING_UPDATE_CHUNK_SIZE = 500
+
+# progress_callback を呼び出す進捗率の刻み幅 (%)
+PROGRESS_STEP_PERCENT = 5
+
 
 class ScannerService:
     def __init__(self):
         self.settings = {}
+        # load_settings 時に一度だけ解析し、スキャン中は解析済みの値を参照する
+        self.scan_paths: List[str] = []
+        self.target_exts: FrozenSet[str] = frozenset()
+        self.exclude_dirs: FrozenSet[str] = frozenset()
 
     async def load_settings(self, db: AsyncSession):
-        result = await db.execute(select(Setting))
-        settings_list = result.scalars().all()
-        for s in settings_list:
-            self.settings[s.key] = s.value
+        # ORMエンティティを生成せず、key/value のみを1回のSELECTで取得する
+        result = await db.execute(select(Setting.key, Setting.value))
+        self.settings = dict(result.all())
+
+        self.scan_paths = self._parse_scan_paths(self._get_setting("scan_paths", "[]"))
+
+        target_exts_str = self._get_setting("target_exts", "")
+        if not target_exts_str.strip():
+            target_exts_str = "mp3,mp4,m4a"
+
+        # Normalize extensions once: lower case with a single leading dot,
+        # so the per-file check is a plain set membership test
+        self.target_exts = frozenset(
+            f".{ext.strip().lower().lstrip('.')}"
+            for ext in target_exts_str.split(",")
+            if ext.strip()
+        )
+
+        exclude_dirs_str = self._get_setting("exclude_dirs", "")
+        self.exclude_dirs = frozenset(
+            d.strip() for d in exclude_dirs_str.split(",") if d.strip()
+        )
 
     def _get_setting(self, key: str, default=None):
         return self.settings.get(key, default)
 
+    @staticmethod
+    def _parse_scan_paths(scan_paths_str) -> List[str]:
+        try:
+            scan_paths = json.loads(scan_paths_str)
+            if not isinstance(scan_paths, list):
+                scan_paths = [scan_paths] if scan_paths else []
+        except (json.JSONDecodeError, TypeError):
+            # Fallback: if it's a string like "['/path']" but with single quotes,
+            # or just a plain string path
+            if isinstance(scan_paths_str, str) and scan_paths_str.strip():
+                import ast
+
+                try:
+                    # Try literal_eval for single quotes/list representation
+                    val = ast.literal_eval(scan_paths_str)
+                    if isinstance(val, list):
+                        scan_paths = val
+                    else:
+                        scan_paths = [str(val)]
+                except (ValueError, SyntaxError):
+                    # Pure fallback for non-list strings
+                    scan_paths = [scan_paths_str]
+            else:
+                scan_paths = []
+        return scan_paths
+
     async def run_scan(self, progress_callback=None, log_callback=None):
         logger.info("Scan started")
         if log_callback:
@@ -37,44 +92,7 @@ class ScannerService:
 
         async with AsyncSessionLocal() as db:
             await self.load_settings(db)
-
-            scan_paths_str = self._get_setting("scan_paths", "[]")
-            try:
-                scan_paths = json.loads(scan_paths_str)
-                if not isinstance(scan_paths, list):
-                    scan_paths = [scan_paths] if scan_paths else []
-            except (json.JSONDecodeError, TypeError):
-                # Fallback: if it's a string like "['/path']" but with single quotes,
-                # or just a plain string path
-                if isinstance(scan_paths_str, str) and scan_paths_str.strip():
-                    import ast
-
-                    try:
-                        # Try literal_eval for single quotes/list representation
-                        val = ast.literal_eval(scan_paths_str)
-                        if isinstance(val, list):
-                            scan_paths = val
-                        else:
-                            scan_paths = [str(val)]
-                    except (ValueError, SyntaxError):
-                        # Pure fallback for non-list strings
-                        scan_paths = [scan_paths_str]
-                else:
-                    scan_paths = []
-
-            target_exts_str = self._get_setting("target_exts", "")
-            if not target_exts_str.strip():
-                target_exts_str = "mp3,mp4,m4a"
-
-            # Normalize extensions: lower case and remove leading dot for comparison later
-            target_exts = [
-                f".{ext.strip().lower().lstrip('.')}"
-                for ext in target_exts_str.split(",")
-                if ext.strip()
-            ]
-
-            exclude_dirs_str = self._get_setting("exclude_dirs", "")
-            exclude_dirs = [d.strip() for d in exclude_dirs_str.split(",") if d.strip()]
+            scan_paths = self.scan_paths
 
             if not scan_paths:
                 msg = "No scan paths configured."
@@ -85,12 +103,13 @@ class ScannerService:
 
             # 1. Scan File System (CPU/IO bound -> ThreadPool)
             files_to_process = await run_in_threadpool(
-                self._scan_filesystem, scan_paths, target_exts, exclude_dirs
+                self._scan_filesystem, scan_paths, self.target_exts, self.exclude_dirs
             )
 
             total_files = len(files_to_process)
             processed_files = 0
             last_progress = 0
+            next_progress = PROGRESS_STEP_PERCENT
 
             # 2. Process Files (Extract Metadata) & Update DB
             # We process in batches or one by one?
@@ -172,27 +191,39 @@ class ScannerService:
                             log_callback(msg)
 
                 processed_files += 1
-                if progress_callback:
-                    current_progress = int((processed_files / total_files) * 100)
-                    if current_progress >= last_progress + 5 or current_progress == 100:
-                        progress_callback(current_progress)
-                        last_progress = current_progress
+                # 整数演算で次の通知閾値と比較し、閾値到達時のみ進捗率を計算する
+                if (
+                    progress_callback
+                    and processed_files * 100 >= next_progress * total_files
+                ):
+                    current_progress = processed_files * 100 // total_files
+                    progress_callback(current_progress)
+                    last_progress = current_progress
+                    next_progress = min(current_progress + PROGRESS_STEP_PERCENT, 100)
 
             # 3. Mark missing files
-            missing_count = 0
+            missing_ids = []
             for file_path, track in existing_tracks.items():
                 if file_path not in files_scanned_set:
                     # File removed
                     # Option A: Delete
                     # Option B: Mark as missing (missing=True)
                     if not track.missing:
-                        track.missing = True
-                        missing_count += 1
+                        missing_ids.append(track.id)
                         msg = f"File missing: {file_path}"
                         logger.info(msg)
                         if log_callback:
                             log_callback(msg)
 
+            # 行ごとのUPDATEではなく、IDをまとめて一括UPDATEする
+            # (SQLiteのバインド変数上限を超えないようチャンクに分割)
+            for i in range(0, len(missing_ids), MISSING_UPDATE_CHUNK_SIZE):
+                chunk = missing_ids[i : i + MISSING_UPDATE_CHUNK_SIZE]
+                await db.execute(
+                    update(Track).where(Track.id.in_(chunk)).values(missing=True)
+                )
+            missing_count = len(missing_ids)
+
             if progress_callback and last_progress < 100:
                 progress_callback(100)
 
@@ -213,38 +244,64 @@ class ScannerService:
             if log_callback:
                 log_callback(summary)
 
-    def _scan_filesystem(self, paths: List[str], exts: List[str], excludes: List[str]):
+    def _scan_filesystem(
+        self, paths: List[str], exts: FrozenSet[str], excludes: FrozenSet[str]
+    ):
         results = []  # (full_path, relative_path, mtime)
         logger.info(f"FileSystem scan started. Target paths: {paths}, Exts: {exts}")
 
         for root_path in paths:
             logger.info(f"Checking root path: {root_path}")
-            if not os.path.exists(root_path):
-                logger.warning(f"Path does not exist: {root_path}")
-                continue
 
             if os.path.islink(root_path):
                 logger.info(
                     f"Root path '{root_path}' is a symbolic link. Target: {os.path.realpath(root_path)}"
                 )
 
-            # We use followlinks=True to ensure mount points that are symlinks are traversed
-            for root, dirs, files in os.walk(root_path, followlinks=True):
-                # Filter excludes
-                original_dirs = list(dirs)
-                dirs[:] = [d for d in dirs if d not in excludes]
-                if len(dirs) != len(original_dirs):
-                    excluded = set(original_dirs) - set(dirs)
-                    logger.debug(f"Excluded directories in {root}: {excluded}")
+            # Strip trailing slash to ensure dirname gives parent
+            root_clean = root_path.rstrip(os.sep)
+            base_dir = os.path.dirname(root_clean)
 
-                for file in files:
-                    # Case insensitive check
-                    if any(file.lower().endswith(ext) for ext in exts):
-                        full_path = os.path.join(root, file)
+            # os.walk 相当の走査を os.scandir で行い、DirEntry が持つ種別情報と
+            # stat 結果を再利用して、ファイル毎の追加のシステムコールを避ける
+            pending_dirs = [root_path]
+            while pending_dirs:
+                current_dir = pending_dirs.pop()
+                try:
+                    it = os.scandir(current_dir)
+                except FileNotFoundError:
+                    if current_dir == root_path:
+                        logger.warning(f"Path does not exist: {root_path}")
+                    continue
+                except OSError as e:
+                    logger.error(f"Error accessing directory {current_dir}: {e}")
+                    continue
+
+                excluded = []
+                with it:
+                    for entry in it:
+                        name = entry.name
+                        try:
+                            # is_dir() follows symlinks, so mount points that are
+                            # symlinks are traversed (same as followlinks=True)
+                            is_dir = entry.is_dir()
+                        except OSError:
+                            is_dir = False
+
+                        if is_dir:
+                            # Filter excludes
+                            if name in excludes:
+                                excluded.append(name)
+                            else:
+                                pending_dirs.append(entry.path)
+                            continue
 
-                        # Strip trailing slash to ensure dirname gives parent
-                        root_clean = root_path.rstrip(os.sep)
-                        base_dir = os.path.dirname(root_clean)
+                        # Case insensitive check
+                        dot = name.rfind(".")
+                        if dot < 0 or name[dot:].lower() not in exts:
+                            continue
+
+                        full_path = entry.path
 
                         rel_path = (
                             full_path[len(base_dir) :]
@@ -255,12 +312,15 @@ class ScannerService:
                             rel_path = os.sep + rel_path
 
                         try:
-                            mtime = os.stat(full_path).st_mtime
+                            mtime = entry.stat().st_mtime
                             results.append((full_path, rel_path, mtime))
                         except OSError as e:
                             logger.error(f"Error accessing file {full_path}: {e}")
                             continue
 
+                if excluded:
+                    logger.debug(f"Excluded directories in {current_dir}: {excluded}")
+
         logger.info(f"FileSystem scan finished. Found {len(results)} matching files.")
         return results
 
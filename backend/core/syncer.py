@@ -1,5 +1,7 @@
 import asyncio
 import ftplib
+import io
+import json
 import logging
 import os
 import subprocess
@@ -16,6 +18,27 @@ from ..db.models import Playlist, PlaylistTrack, Setting, Track
 
 logger = logging.getLogger(__name__)
 
+# パス区切り文字 (Windows の \ と OS 固有の区切り) を / に変換するテーブル
+# str.replace を繰り返すより、str.translate で1回走査する方が速い
+_SEP_TO_SLASH = str.maketrans({"\\": "/", os.sep: "/"})
+
+# FTP アップロード時の読み込み/送信単位 (ftplib の既定は 8KiB)
+FTP_UPLOAD_BLOCKSIZE = 1024 * 1024
+
+
+def _open_for_upload(path):
+    """
+    アップロード元のファイルを開く。
+    先頭から順に読み切るため、対応OS (Linux等) ではカーネルに先読みを促す。
+    """
+    f = open(path, "rb")
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass
+    return f
+
 
 # Base Synchronizer
 class AudioSynchronizer(ABC):
@@ -61,6 +84,12 @@ class AudioSynchronizer(ABC):
     def ls_remote(self, relative_dir=""):
         pass
 
+    def _playlist_target(self, relative_dir, name):
+        """プレイリストファイルのリモート側の相対パスを返す"""
+        target = relative_dir + self.remote_os_sep + name + ".m3u"
+        # Normalize target sep?
+        return target.replace(os.sep, self.remote_os_sep).replace("//", "/")
+
     def put_playlist_file(self, relative_dir=""):
         for pl in self.playlists:
             name = pl["name"]
@@ -70,10 +99,7 @@ class AudioSynchronizer(ABC):
                 f.write(content)
                 f.flush()
             self.log(f"Copying playlist: {name}.m3u")
-            target = relative_dir + self.remote_os_sep + name + ".m3u"
-            # Normalize target sep?
-            target = target.replace(os.sep, self.remote_os_sep).replace("//", "/")
-            self.cp(path, target)
+            self.cp(path, self._playlist_target(relative_dir, name))
             os.close(fd)
             os.remove(path)
 
@@ -82,8 +108,23 @@ class AudioSynchronizer(ABC):
         target_exts = self.settings.get("target_exts", "mp3,mp4,m4a").split(",")
         target_exts = [f".{e.strip()}" for e in target_exts]
 
-        # 1. List remote files
-        remote_files = set()  # Set of relative paths
+        # 1. Collect local tracks to sync
+        tracks_to_sync = [t for t in self.tracks if t.sync]
+
+        # normalized relative paths for comparison (remote sep)
+        # t.relative_path is expected to be consistent (e.g. "Artist/Album/Song.mp3")
+        # Ensure remote_sep
+        # Also strip leading slash so it matches traverse_remote result (which builds paths relative to root without leading slash)
+        local_map = {
+            t.relative_path.translate(_SEP_TO_SLASH).removeprefix("/"): t
+            for t in tracks_to_sync
+        }
+
+        # 2. List remote files and determine actions
+        # リモートの全ファイル一覧は保持せず、走査しながら
+        # 「既に存在する同期対象」と「削除対象」に振り分ける
+        existing = set()  # local_map のうちリモートに存在するパス
+        stale_files = []  # local_map にないリモートファイル (削除対象)
 
         def traverse_remote(rel_path):
             try:
@@ -97,47 +138,43 @@ class AudioSynchronizer(ABC):
                 )
                 if is_dir:
                     traverse_remote(child_path)
+                elif child_path in local_map:
+                    existing.add(child_path)
                 else:
-                    remote_files.add(child_path)
+                    stale_files.append(child_path)
 
         self.log(f"Scanning remote: {sync_dest}")
         traverse_remote("")
 
-        # 2. Determine actions
-        tracks_to_sync = [t for t in self.tracks if t.sync]
-
-        # normalized relative paths for comparison (remote sep)
-        local_map = {}
-        for t in tracks_to_sync:
-            # t.relative_path is expected to be consistent (e.g. "Artist/Album/Song.mp3")
-            # Ensure remote_sep
-            # Also strip leading slash so it matches traverse_remote result (which builds paths relative to root without leading slash)
-            r_path = t.relative_path.replace("\\", "/").replace(os.sep, "/")
-            if r_path.startswith("/"):
-                r_path = r_path[1:]
-
-            local_map[r_path] = t
-
         # COPY
+        # 転送先ディレクトリごとにまとめ、ディレクトリ作成(FTPではCWDも)を
+        # ディレクトリあたり1回で済ませる
+        # 既にリモートに存在するファイルはスキップ (サイズ/日付は比較しない)
+        # r_path は / 区切りに正規化済みのため、親ディレクトリは rpartition で求める
+        copy_groups = {}
+        for r_path, track in local_map.items():
+            if r_path not in existing:
+                target_dir = r_path.rpartition("/")[0]
+                copy_groups.setdefault(target_dir, []).append((r_path, track))
+
+        # (曲数分回るループのため、属性参照はループ外でローカル変数に束縛しておく)
+        cp = self.cp
+        log = self.log
         count = 0
         total = len(tracks_to_sync)
-        for r_path, track in local_map.items():
-            if r_path not in remote_files:
+        for target_dir, items in copy_groups.items():
+            self.mkdir_p_remote(target_dir)
+            for r_path, track in items:
                 count += 1
-                self.log(f"[{count}/{total}] Copying: {track.file_name}")
-                target_dir = os.path.dirname(r_path)
-                self.mkdir_p_remote(target_dir)  # Optimization: cache created dirs
-                self.cp(track.file_path, r_path)
-            else:
-                # Already exists. Check size/date? Skip for now per original logic (if exists, skip)
-                pass
+                log(f"[{count}/{total}] Copying: {track.file_name}")
+                cp(track.file_path, r_path)
 
         # DELETE
-        # Iterate remote files, if not in local_map, delete
-        for r_file in remote_files:
-            if r_file not in local_map:
-                self.log(f"Removing remote file: {r_file}")
-                self.rm_remote(r_file)
+        # local_map にないリモートファイルを削除する
+        # (target_exts に含まれない不要ファイルも削除対象)
+        for r_file in stale_files:
+            self.log(f"Removing remote file: {r_file}")
+            self.rm_remote(r_file)
 
         # Playlist
         self.put_playlist_file()
@@ -225,6 +262,18 @@ class RsyncSynchronizer(AudioSynchronizer):
         super().__init__(tracks, playlists, settings, log_callback)
         self.remote_os_sep = "/"
         # Settings: rsync_host, rsync_port, rsync_user, rsync_path
+        # 鍵ファイルの存在確認は synchronize / cp の呼び出しごとに行わず、1回だけ行う
+        key_path = self.settings.get("rsync_key_path")
+        self._ssh_key_exists = (
+            self.settings.get("rsync_use_key", "0") == "1"
+            and bool(key_path)
+            and os.path.exists(key_path)
+        )
+        # scan_paths の JSON も synchronize の呼び出しごとに解析せず、ここで1回だけ行う
+        try:
+            self._scan_paths = json.loads(self.settings.get("scan_paths", "[]"))
+        except Exception:
+            self._scan_paths = []
 
     def rsync_escape(self, path: str) -> str:
         r"""
@@ -262,39 +311,40 @@ class RsyncSynchronizer(AudioSynchronizer):
         include_list = set()
         tracks_to_sync = [t for t in self.tracks if t.sync]
 
+        seen_dirs = set()
         for t in tracks_to_sync:
-            # Add all parent dirs
-            parts = t.relative_path.replace("\\", "/").split("/")
-            for i in range(1, len(parts)):
-                dir_path = "/".join(parts[:i]) + "/"
-                include_list.add(self.rsync_escape(dir_path))
-
             full_path = t.relative_path.replace("\\", "/")
             include_list.add(self.rsync_escape(full_path))
 
+            # Add all parent dirs
+            # 深い方から辿り、登録済みの親に達したらその上位も登録済みなので打ち切る
+            head, sep, _ = full_path.rpartition("/")
+            while sep:
+                dir_path = head + "/"
+                if dir_path in seen_dirs:
+                    break
+                seen_dirs.add(dir_path)
+                include_list.add(self.rsync_escape(dir_path))
+                head, sep, _ = head.rpartition("/")
+
         fd, include_path = tempfile.mkstemp()
 
         try:
+            # 1行ずつ write せず、内容をまとめて1回で書き込む
             with open(include_path, "w") as f:
-                for p in include_list:
-                    f.write(p + "\n")
+                f.write("".join(p + "\n" for p in include_list))
 
             # Get source directories from settings
-            scan_paths_str = self.settings.get("scan_paths", "[]")
-            import json
-
-            try:
-                scan_paths = json.loads(scan_paths_str)
-            except Exception:
-                scan_paths = []
-            if not scan_paths:
+            if not self._scan_paths:
                 self.log("No scan paths configured")
                 return
 
-            src_dirs = [s.rstrip(os.sep) for s in scan_paths]
+            src_dirs = [s.rstrip(os.sep) for s in self._scan_paths]
 
             # Build rsync command
-            cmd = []
+            # 認証方式 / リモート先に応じた前後の引数を決めてから、1回で組み立てる
+            prefix = []
+            ssh_args = []
 
             # hostが定義されている場合のみSSH認証を使用
             if host:
@@ -306,31 +356,18 @@ class RsyncSynchronizer(AudioSynchronizer):
                             "SSH key authentication enabled but key path not configured"
                         )
                         return
-                    if not os.path.exists(key_path):
+                    if not self._ssh_key_exists:
                         self.log(f"SSH key file not found: {key_path}")
                         return
                     self.log(f"Using SSH key authentication: {key_path}")
                 elif password:
                     # パスワード認証（sshpassを使用）
-                    cmd = ["sshpass", "-p", password]
+                    prefix = ["sshpass", "-p", password]
                     self.log("Using password authentication")
                 else:
                     self.log("No valid authentication method configured for SSH")
                     return
 
-            # rsyncコマンドの基本部分
-            cmd.extend(
-                [
-                    "rsync",
-                    "-avz",
-                    "--delete-excluded",
-                    "--include-from",
-                    include_path,
-                    "--exclude=*",
-                ]
-            )
-            cmd.extend(src_dirs)
-
             # リモート先の設定
             if host:
                 # SSH経由でのリモート同期
@@ -338,7 +375,7 @@ class RsyncSynchronizer(AudioSynchronizer):
                 if use_key and key_path:
                     ssh_opts += f" -i {key_path}"
 
-                cmd.extend(["-e", ssh_opts])
+                ssh_args = ["-e", ssh_opts]
 
                 if user:
                     remote = f"{user}@{host}:{dest_path}"
@@ -348,18 +385,31 @@ class RsyncSynchronizer(AudioSynchronizer):
                 # ローカル同期
                 remote = dest_path
 
-            cmd.append(remote)
+            cmd = [
+                *prefix,
+                "rsync",
+                "-avz",
+                "--delete-excluded",
+                "--include-from",
+                include_path,
+                "--exclude=*",
+                *src_dirs,
+                *ssh_args,
+                remote,
+            ]
 
             # Log command without password
             log_cmd = [c if c != password else "***" for c in cmd]
             self.log(f"Running rsync: {' '.join(log_cmd)}")
 
+            # 出力はバイト列のまま受け取り、ログに出す行だけをデコードする
+            # (UTF-8 として不正なファイル名が含まれていても止まらないよう replace)
             proc = subprocess.Popen(
-                cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+                cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT
             )
             for line in proc.stdout:
-                if not line.rstrip().endswith("/"):  # ディレクトリのログは表示しない
-                    self.log(line.strip())
+                if not line.rstrip().endswith(b"/"):  # ディレクトリのログは表示しない
+                    self.log(line.decode("utf-8", errors="replace").strip())
             proc.wait()
 
             if proc.returncode != 0:
@@ -393,7 +443,7 @@ class RsyncSynchronizer(AudioSynchronizer):
         if host:
             if use_key:
                 # SSH鍵認証
-                if not key_path or not os.path.exists(key_path):
+                if not self._ssh_key_exists:
                     self.log(f"SSH key not available: {key_path}")
                     return
             elif password:
@@ -467,6 +517,15 @@ class FtpSynchronizer(AudioSynchronizer):
             self.ftp.connect(host=ip_addr, port=port)
             self.ftp.login(user=user, passwd=passwd)
             self.log("FTP login success.")
+            # 現在の作業ディレクトリ (絶対パス)。不明な場合は None
+            self._cwd = None
+            self._chdir("/")
+            # 存在を確認済み(または作成済み)のディレクトリ (絶対パス)
+            self._known_dirs = {"/"}
+            # MLST/MLSD に対応していないサーバーでは False にし、以降は使わない
+            self._use_mlst = True
+            self._use_mlsd = True
+            self._detect_features()
         except Exception as e:
             self.log(f"FTP connection failed: {e}")
             raise
@@ -495,96 +554,201 @@ class FtpSynchronizer(AudioSynchronizer):
             return "/" + rel
         return root + "/" + rel
 
+    def _detect_features(self):
+        """
+        FEAT で MLST/MLSD への対応を接続時に1回だけ確認する。
+        FEAT 自体に対応していない場合は、従来通り実際に試して判断する。
+        """
+        try:
+            resp = self.ftp.sendcmd("FEAT")
+        except ftplib.Error:
+            # 任意機能の確認なので、どの応答エラーでも同期は止めない
+            return
+        # 先頭行 (211-...) と末尾行 (211 End) の間に1行1機能で並ぶ
+        features = {
+            line.strip().split(" ", 1)[0].upper()
+            for line in resp.splitlines()[1:-1]
+            if line.strip()
+        }
+        # "211 no features" のように一覧が返らない場合は、実際に試して判断する
+        if not features:
+            return
+        # RFC 3659: MLST の掲載は MLSD への対応も意味する
+        self._use_mlst = "MLST" in features
+        self._use_mlsd = "MLST" in features or "MLSD" in features
+
+    def _chdir(self, remote_dir):
+        """
+        作業ディレクトリを remote_dir (絶対パス) に移動する。
+        既にそのディレクトリにいる場合は CWD を発行しない。
+        """
+        if self._cwd == remote_dir:
+            return
+        # 途中で失敗した場合に備え、移動が完了するまでは不明 (None) とする
+        if self._cwd != "/":
+            # Ensure we are at root before CWD to absolute-like path
+            self._cwd = None
+            self.ftp.cwd("/")
+            self._cwd = "/"
+        if remote_dir.strip("/"):
+            self._cwd = None
+            self.ftp.cwd(remote_dir.lstrip("/"))
+        self._cwd = remote_dir
+
     def cp(self, filepath_from, relative_path_to):
+        self._upload(relative_path_to, lambda: _open_for_upload(filepath_from))
+
+    def put_playlist_file(self, relative_dir=""):
+        # 一時ファイルを経由せず、メモリ上の内容をそのままアップロードする
+        for pl in self.playlists:
+            name = pl["name"]
+            data = pl["content"].encode("utf-8")
+            self.log(f"Copying playlist: {name}.m3u")
+            target = self._playlist_target(relative_dir, name)
+            self._upload(target, lambda: io.BytesIO(data))
+
+    def _upload(self, relative_path_to, open_source):
+        """open_source() が返すファイルオブジェクトの内容を STOR する"""
         full_path = self._get_full_remote_path(relative_path_to)
         remote_dir = os.path.dirname(full_path)
         filename = os.path.basename(full_path)
 
         self.log(f"FTP Uploading: {filename} to {remote_dir}")
         try:
-            # Ensure we are at root before CWD to absolute-like path
-            self.ftp.cwd("/")
-            self.ftp.cwd(remote_dir.lstrip("/"))
-            with open(filepath_from, "rb") as f:
+            # 同じディレクトリへの連続アップロードでは CWD を省略する
+            self._chdir(remote_dir)
+            # ファイル全体は読み込まず、ファイルオブジェクトから分割して送信する
+            with open_source() as f:
                 stor = "STOR " + filename
-                self.ftp.storbinary(stor, f)
+                self.ftp.storbinary(stor, f, blocksize=FTP_UPLOAD_BLOCKSIZE)
             self.log(f"FTP STOR success: {filename} at {remote_dir}")
         except Exception as e:
             self.log(f"FTP STOR failed for {filename}: {e}")
             # Do not raise, just log error to allow sync to continue with other files
             return
-        finally:
-            try:
-                self.ftp.cwd("/")
-            except Exception:
-                pass
 
     def rm_remote(self, relative_filepath_to):
         full_path = self._get_full_remote_path(relative_filepath_to)
         try:
+            # パスはルートからの相対パスで指定するため、ルートに戻しておく
+            self._chdir("/")
             self.ftp.delete(full_path.lstrip("/"))
             self.log(f"FTP delete success: {full_path}")
         except ftplib.error_perm as e:
             self.log(f"FTP delete failed: {e}")
 
+    def _remote_dir_exists(self, full_path):
+        """MLST でディレクトリの存在を1往復で確認する"""
+        if not self._use_mlst:
+            return False
+        try:
+            resp = self.ftp.sendcmd("MLST " + full_path.lstrip("/"))
+        except ftplib.Error as e:
+            # 500/502: MLST 非対応。550 等: 存在しない
+            # それ以外の応答エラーも存在しないものとして扱い、MKD に任せる
+            if str(e)[:3] in ("500", "502"):
+                self._use_mlst = False
+            return False
+        resp = resp.lower()
+        return any(f"type={t};" in resp for t in ("dir", "cdir", "pdir"))
+
     def mkdir_p_remote(self, relative_filepath_to):
         # Create directories recursively
         full_path = self._get_full_remote_path(relative_filepath_to)
+        if full_path in self._known_dirs:
+            return
+
+        # パスはルートからの相対パスで指定するため、ルートに戻しておく
+        self._chdir("/")
+        # 2回目以降の同期では既に存在することが多いため、
+        # 階層ごとに MKD する前に末端のディレクトリの存在を確認する
+        if self._remote_dir_exists(full_path):
+            self._known_dirs.add(full_path)
+            return
+
         parts = full_path.strip("/").split("/")
         current = ""
         for part in parts:
             current = (current + "/" + part) if current else ("/" + part)
+            if current in self._known_dirs:
+                continue
             try:
                 self.ftp.mkd(current.lstrip("/"))
                 self.log(f"FTP MKD success: {current}")
             except ftplib.error_perm:
                 # ignore if directory already exists
                 pass
+            self._known_dirs.add(current)
 
     def ls_remote(self, relative_dir=""):
         target = self._get_full_remote_path(relative_dir)
 
         self.log(f"FTP Listing: {target}")
+        items = None
+        if self._use_mlsd:
+            # パスはルートからの相対パスで指定するため、ルートに戻しておく
+            self._chdir("/")
+            try:
+                # パスを指定して MLSD することで、ディレクトリごとの CWD を省く
+                # MLSD without facts avoids OPTS MLST which is often unsupported
+                items = []
+                for name, facts in self.ftp.mlsd(path=target.lstrip("/")):
+                    if name in [".", ".."]:
+                        continue
+                    is_dir = facts.get("type") == "dir"
+                    items.append((name, is_dir))
+            except Exception as e:
+                code = str(e)[:3] if isinstance(e, ftplib.error_perm) else ""
+                if code == "550":
+                    # 初回同期では存在しないのが通常なので、nlst で再確認はしない
+                    raise FileNotFoundError(f"FTP directory not found: {target}") from e
+                if code in ("500", "502"):
+                    # MLSD 非対応のサーバーでは、以降は nlst を使う
+                    self._use_mlsd = False
+                    self.log("FTP MLSD not supported. Using nlst.")
+                else:
+                    self.log(
+                        f"FTP MLSD failed for {target}: {e}. Falling back to nlst."
+                    )
+                items = None
+
+        if items is None:
+            items = self._ls_nlst(target)
+        self.log(f"FTP Listing found {len(items)} items in {target}")
+        return items
+
+    def _ls_nlst(self, target):
+        """MLSD を使わずに、CWD + nlst でディレクトリの一覧を取得する"""
         # Check existence first
         try:
-            self.ftp.cwd("/")
-            self.ftp.cwd(target.lstrip("/"))
+            self._chdir(target)
         except ftplib.error_perm:
             raise FileNotFoundError(f"FTP directory not found: {target}")
 
         items = []
         try:
-            # MLSD without facts avoids OPTS MLST which is often unsupported
-            for name, facts in self.ftp.mlsd(path=""):
+            # nlst gives only names
+            names = self.ftp.nlst()
+            for name in names:
                 if name in [".", ".."]:
                     continue
-                is_dir = facts.get("type") == "dir"
-                items.append((name, is_dir))
-        except (ftplib.error_perm, Exception) as e:
-            self.log(f"FTP MLSD failed for {target}: {e}. Falling back to nlst.")
-            try:
-                # nlst gives only names
-                names = self.ftp.nlst()
-                for name in names:
-                    if name in [".", ".."]:
-                        continue
-                    # Check if it's a directory by trying to CWD
-                    is_dir = False
-                    try:
-                        self.ftp.cwd(name)
-                        is_dir = True
-                        self.ftp.cwd("..")
-                    except ftplib.error_perm:
-                        is_dir = False
-                    items.append((name, is_dir))
-            except Exception as e2:
-                self.log(f"FTP nlst fallback also failed: {e2}")
-        finally:
-            try:
-                self.ftp.cwd("/")
-            except Exception:
-                pass
-        self.log(f"FTP Listing found {len(items)} items in {target}")
+                # Check if it's a directory by trying to CWD
+                try:
+                    self.ftp.cwd(name)
+                except ftplib.error_perm:
+                    items.append((name, False))
+                    continue
+                try:
+                    self.ftp.cwd("..")
+                except ftplib.error_perm:
+                    # 移動先から戻れなかった場合は、対象ディレクトリへ移動し直す
+                    self._cwd = None
+                    self._chdir(target)
+                items.append((name, True))
+        except Exception as e2:
+            # 途中で失敗した場合に備え、作業ディレクトリは不明とする
+            self._cwd = None
+            self.log(f"FTP nlst fallback also failed: {e2}")
         return items
 
 
@@ -593,7 +757,12 @@ def make_m3u8(tracks: List[Track], remote_sep="/") -> str:
     # #EXTM3U
     # #EXTINF:-1,Title
     # path/to/file.mp3
-    rt = "#EXTM3U\n\n"
+    # 文字列の連結を繰り返すと曲数に対して二乗オーダーになるため、最後に join する
+    parts = ["#EXTM3U\n\n"]
+    if remote_sep == "/":
+        sep_table = _SEP_TO_SLASH
+    else:
+        sep_table = str.maketrans({c: remote_sep for c in ("\\", os.sep, "/")})
     for t in tracks:
         if not t.relative_path:
             continue
@@ -609,16 +778,13 @@ def make_m3u8(tracks: List[Track], remote_sep="/") -> str:
         # [1:] implies removing leading slash.
 
         # Replace backslashes (Windows) and OS specific sep with remote_sep
-        p = t.relative_path.replace("\\", "/").replace(os.sep, "/")
-        if remote_sep != "/":
-            p = p.replace("/", remote_sep)
+        p = t.relative_path.translate(sep_table)
 
         if p.startswith(remote_sep):
             p = p[len(remote_sep) :]
 
-        rt += f"#EXTINF:-1,{title}\n"
-        rt += f"{p}\n\n"
-    return rt
+        parts.append(f"#EXTINF:-1,{title}\n{p}\n\n")
+    return "".join(parts)
 
 
 class SyncService:
@@ -1,3 +1,4 @@
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
@@ -10,6 +11,19 @@ DATABASE_URL = f"sqlite+aiosqlite:///{DB_DIR}/syncterra.db"
 
 engine = create_async_engine(DATABASE_URL, echo=True)
 
+
+@event.listens_for(engine.sync_engine, "connect")
+def _set_sqlite_pragmas(dbapi_conn, _connection_record):
+    # スキャン時の大量書き込みでコミット毎のfsyncがボトルネックになるため、
+    # WAL + synchronous=NORMAL に切り替える (WALではクラッシュ時も整合性は保たれる)
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-65536")
+    cursor.close()
+
+
 AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
@@ -1,5 +1,6 @@
 import logging
 import os
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -13,7 +14,16 @@ from .db.database import init_db
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Syncterra API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 起動時に一度だけDBを初期化する
+    await init_db()
+    await init_albumart_db()
+    yield
+
+
+app = FastAPI(title="Syncterra API", lifespan=lifespan)
 
 # CORS設定 - フロントエンドからのアクセスを許可
 app.add_middleware(
@@ -36,12 +46,6 @@ async def get_asyncapi():
     return FileResponse(asyncapi_path, media_type="application/x-yaml")
 
 
-@app.on_event("startup")
-async def on_startup():
-    await init_db()
-    await init_albumart_db()
-
-
 app.include_router(settings.router)
 app.include_router(tracks.router)
 app.include_router(system.router)
@@ -32,6 +32,10 @@ export const updateSetting = async (
   await apiClient.put('/api/settings', { key, value });
 };
 
+export const updateSettings = async (settings: Setting[]): Promise<void> => {
+  await apiClient.put('/api/settings/bulk', settings);
+};
+
 // Tracks API
 
 export const getTracks = async (): Promise<Track[]> => {
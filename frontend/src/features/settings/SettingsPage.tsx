@@ -31,7 +31,7 @@ import type { AppSettings, SyncMethod } from '../../types/settings';
 import { DEFAULT_SETTINGS } from '../../types/settings';
 import {
   getSettings,
-  updateSetting,
+  updateSettings,
   deleteMissingTracks,
   getTracks,
   deleteTracks,
@@ -147,42 +147,33 @@ export default function SettingsPage() {
   const handleSave = async () => {
     setLoading(true);
     try {
-      // 各設定をバックエンドに送信
-      await updateSetting(
-        SETTING_KEYS.scanPaths,
-        JSON.stringify(settings.scanPaths)
-      );
-      await updateSetting(
-        SETTING_KEYS.excludeDirs,
-        settings.excludeDirs.join(',')
-      );
-      await updateSetting(
-        SETTING_KEYS.targetExtensions,
-        settings.targetExtensions.join(',')
-      );
-      await updateSetting(SETTING_KEYS.syncDestPath, settings.syncDestPath);
-      await updateSetting(SETTING_KEYS.syncMethod, settings.syncMethod);
-
-      if (settings.ftpHost)
-        await updateSetting(SETTING_KEYS.ftpHost, settings.ftpHost);
-      if (settings.ftpPort)
-        await updateSetting(SETTING_KEYS.ftpPort, String(settings.ftpPort));
-      if (settings.ftpUser)
-        await updateSetting(SETTING_KEYS.ftpUser, settings.ftpUser);
-      if (settings.ftpPassword)
-        await updateSetting(SETTING_KEYS.ftpPassword, settings.ftpPassword);
-
-      if (settings.rsyncHost)
-        await updateSetting(SETTING_KEYS.rsyncHost, settings.rsyncHost);
-      if (settings.rsyncPort)
-        await updateSetting(SETTING_KEYS.rsyncPort, String(settings.rsyncPort));
-      if (settings.rsyncUser)
-        await updateSetting(SETTING_KEYS.rsyncUser, settings.rsyncUser);
-      if (settings.rsyncPassword)
-        await updateSetting(SETTING_KEYS.rsyncPassword, settings.rsyncPassword);
-      await updateSetting(
-        SETTING_KEYS.rsyncUseKey,
-        settings.rsyncUseKey ? '1' : '0'
+      // 各設定をまとめてバックエンドに送信（1リクエストで一括保存）
+      const values: Record<string, string> = {
+        [SETTING_KEYS.scanPaths]: JSON.stringify(settings.scanPaths),
+        [SETTING_KEYS.excludeDirs]: settings.excludeDirs.join(','),
+        [SETTING_KEYS.targetExtensions]: settings.targetExtensions.join(','),
+        [SETTING_KEYS.syncDestPath]: settings.syncDestPath,
+        [SETTING_KEYS.syncMethod]: settings.syncMethod,
+        [SETTING_KEYS.rsyncUseKey]: settings.rsyncUseKey ? '1' : '0',
+      };
+
+      // FTP/Rsyncの接続情報は入力されている場合のみ保存
+      const optionalValues: Record<string, string | number | undefined> = {
+        [SETTING_KEYS.ftpHost]: settings.ftpHost,
+        [SETTING_KEYS.ftpPort]: settings.ftpPort,
+        [SETTING_KEYS.ftpUser]: settings.ftpUser,
+        [SETTING_KEYS.ftpPassword]: settings.ftpPassword,
+        [SETTING_KEYS.rsyncHost]: settings.rsyncHost,
+        [SETTING_KEYS.rsyncPort]: settings.rsyncPort,
+        [SETTING_KEYS.rsyncUser]: settings.rsyncUser,
+        [SETTING_KEYS.rsyncPassword]: settings.rsyncPassword,
+      };
+      for (const [key, value] of Object.entries(optionalValues)) {
+        if (value) values[key] = String(value);
+      }
+
+      await updateSettings(
+        Object.entries(values).map(([key, value]) => ({ key, value }))
       );
 
       notifications.show({
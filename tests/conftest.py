@@ -0,0 +1,136 @@
+"""
+Tests: 共通Fixture (Unit / Integration 共通)
+
+主要なFixture:
+- inline_threadpool: run_in_threadpool を同期実行に置き換えるパッチを生成する
+- fake_result: db.execute() の戻り値 (Result) の軽量な代替を生成する
+- fake_session: AsyncSession の軽量な代替を生成する
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+
+async def _run_inline(func, *args):
+    """run_in_threadpool の代替。スレッドを使わずにその場で実行する"""
+    return func(*args)
+
+
+@pytest.fixture
+def inline_threadpool():
+    """
+    指定したモジュールの run_in_threadpool を同期実行に置き換えるパッチを返すFixture。
+
+    AsyncMock を使うため、assert_awaited_* による検証も可能。
+
+    使用例:
+        def test_example(inline_threadpool):
+            with inline_threadpool("backend.core.syncer.run_in_threadpool") as m:
+                ...
+            m.assert_awaited_once()
+    """
+
+    def _patch(target):
+        return patch(target, new_callable=AsyncMock, side_effect=_run_inline)
+
+    return _patch
+
+
+class _FakeScalars:
+    """Result.scalars() の戻り値の代替 (first / all / unique のみ対応)"""
+
+    def __init__(self, values):
+        self._values = values
+
+    def first(self):
+        return self._values[0] if self._values else None
+
+    def all(self):
+        return list(self._values)
+
+    def unique(self):
+        return self
+
+
+class _FakeResult:
+    """AsyncSession.execute() の戻り値の代替 (scalars のみ対応)"""
+
+    def __init__(self, values):
+        self._scalars = _FakeScalars(values)
+
+    def scalars(self):
+        return self._scalars
+
+
+@pytest.fixture
+def fake_result():
+    """
+    db.execute() の戻り値として使う軽量な Result を生成するFixture。
+
+    呼び出し記録が不要な場合に MagicMock の代わりに使う。
+    scalars().first() は先頭の値 (なければ None)、scalars().all() は全ての値を返す。
+
+    使用例:
+        mock_db.execute.return_value = fake_result(playlist)  # first() -> playlist
+        mock_db.execute.return_value = fake_result()  # first() -> None, all() -> []
+    """
+
+    def _fake_result(*values):
+        return _FakeResult(list(values))
+
+    return _fake_result
+
+
+class _FakeSession:
+    """
+    AsyncSession の代替 (execute / add / delete / commit / refresh のみ対応)
+
+    execute は渡された Result を順に返し、尽きた後は空の Result を返す。
+    呼び出し内容は属性に記録されるため、assert_* の代わりに属性を検証する。
+    """
+
+    def __init__(self, results):
+        self._results = iter(results)
+        self.executed = 0
+        self.added = []
+        self.deleted = []
+        self.commits = 0
+        self.refreshed = []
+
+    async def execute(self, statement):
+        self.executed += 1
+        return next(self._results, _FakeResult([]))
+
+    def add(self, obj):
+        self.added.append(obj)
+
+    async def delete(self, obj):
+        self.deleted.append(obj)
+
+    async def commit(self):
+        # 実DBの INSERT と同様に、未採番の追加オブジェクトへ id を振る
+        for i, obj in enumerate(self.added, start=1):
+            if getattr(obj, "id", None) is None:
+                obj.id = i
+        self.commits += 1
+
+    async def refresh(self, obj):
+        self.refreshed.append(obj)
+
+
+@pytest.fixture
+def fake_session():
+    """
+    db.execute() の戻り値を順に返す軽量な AsyncSession を生成するFixture。
+
+    使用例:
+        db = fake_session(fake_result(playlist), fake_result())
+        await update_playlist(playlist_id=1, update_data=data, db=db)
+        assert db.commits == 1
+    """
+
+    def _fake_session(*results):
+        return _FakeSession(results)
+
+    return _fake_session
@@ -3,48 +3,47 @@ Integration Tests: 共通Fixture
 目的: Integrationテストで利用する共通のセットアップ（DB、ファイルシステム、クライアント等）を提供する。
 
 主要なFixture:
-- temp_db: テスト専用のインメモリSQLiteデータベースセッション
+- db_engine: セッション全体で共有するインメモリSQLiteエンジン (テーブル作成は1回のみ)
+- temp_db: テスト専用のデータベースセッション (終了時にロールバック)
 - override_get_db: FastAPIの依存性注入をオーバーライドし、temp_dbを使用させる
-- client: FastAPIテストクライアント
+- asgi_transport: セッション全体で共有するASGITransport
+- client: asgi_transportを利用する非同期HTTPクライアント (httpx.AsyncClient)
+- sync_client: WebSocketテスト用にセッション全体で共有する同期版TestClient
 - temp_fs: ダミー音楽ファイルを含む一時ディレクトリ
+- make_track: 既定のパスを補完してTrackを生成するファクトリ
 - create_settings: テスト用設定を簡単にDBに追加するヘルパー
 - patch_db_session: Scanner/Syncerなど独自セッションを持つサービス用のパッチ
+- art_db_engine / temp_art_db: アルバムアート用DBの共有エンジンとテスト用セッション
 """
 
 import os
 import shutil
 import tempfile
+from contextlib import asynccontextmanager
 
 import pytest
 import pytest_asyncio
 from fastapi.testclient import TestClient
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.future import select
-from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from backend.db.database import Base, get_db
 from backend.main import app
 
 # テスト用データベースURL
-# :memory: を使用することで、テストごとに独立したDBが生成され、高速かつ安全にテストできる
+# :memory: を使用することで、ファイルI/Oなしで高速かつ安全にテストできる
 SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 
 
-@pytest_asyncio.fixture
-async def temp_db():
+async def _create_test_engine(metadata):
     """
-    テスト専用のインメモリSQLiteデータベースセッションを提供するFixture。
-
-    特徴:
-    - 各テストで独立したDBインスタンスを使用（並列実行セーフ）
-    - StaticPoolによりコネクションを維持（インメモリDBの永続性を確保）
-    - テスト終了後に自動的にクリーンアップ
+    インメモリSQLiteエンジンを生成し、metadata のテーブルを作成する。
 
-    使用例:
-        async def test_example(temp_db):
-            temp_db.add(SomeModel(...))
-            await temp_db.commit()
+    sqlite3ドライバの暗黙的なトランザクション管理を無効化し、BEGINを明示的に発行する。
+    これがないと SAVEPOINT の RELEASE がそのまま COMMIT になり、ロールバックできない。
     """
     engine = create_async_engine(
         SQLALCHEMY_DATABASE_URL,
@@ -52,20 +51,75 @@ async def temp_db():
         poolclass=StaticPool,  # インメモリDBでセッション間のデータ共有に必要
     )
 
+    @event.listens_for(engine.sync_engine, "connect")
+    def _disable_pysqlite_transaction(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
     # テーブル作成
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(metadata.create_all)
 
-    # セッションファクトリ作成
-    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    return engine
 
-    async with async_session() as session:
-        yield session
-        await session.close()
 
+@asynccontextmanager
+async def _rollback_session(engine):
+    """
+    外側トランザクション内で動作するセッションを提供し、終了時にロールバックする。
+    session.commit() は SAVEPOINT の確定のみとなり、外側トランザクションは確定しない。
+    """
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        session = AsyncSession(
+            bind=conn,
+            expire_on_commit=False,
+            join_transaction_mode="create_savepoint",
+        )
+        try:
+            yield session
+        finally:
+            await session.close()
+            await trans.rollback()
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def db_engine():
+    """
+    テストセッション全体で共有するインメモリSQLiteエンジンを提供するFixture。
+
+    特徴:
+    - エンジン生成とテーブル作成はセッションで1回のみ
+    - StaticPoolによりコネクションを維持（インメモリDBの永続性を確保）
+    - テスト間の独立性は temp_db のトランザクションロールバックで担保する
+    """
+    engine = await _create_test_engine(Base.metadata)
+    yield engine
     await engine.dispose()
 
 
+@pytest_asyncio.fixture
+async def temp_db(db_engine):
+    """
+    テスト専用のインメモリSQLiteデータベースセッションを提供するFixture。
+
+    特徴:
+    - 共有エンジン (db_engine) 上の外側トランザクション内でセッションを生成
+    - session.commit() は SAVEPOINT の確定のみとなり、外側トランザクションは確定しない
+    - テスト終了時に外側トランザクションをロールバックし、次のテストへ持ち越さない
+
+    使用例:
+        async def test_example(temp_db):
+            temp_db.add(SomeModel(...))
+            await temp_db.commit()
+    """
+    async with _rollback_session(db_engine) as session:
+        yield session
+
+
 @pytest_asyncio.fixture(autouse=True)
 async def override_get_db(temp_db):
     """
@@ -85,21 +139,49 @@ async def override_get_db(temp_db):
     app.dependency_overrides.clear()
 
 
-@pytest.fixture
-def client(override_get_db):
+@pytest.fixture(scope="session")
+def asgi_transport():
+    """
+    セッション全体で共有するASGITransportを提供するFixture。
+
+    特徴:
+    - appに対するトランスポートはステートレスなため、テスト毎に再生成せず使い回す
+    - DBはoverride_get_db (function scope) によりテスト毎に差し替わるため、
+      共有してもテストの独立性は保たれる
+    """
+    return ASGITransport(app=app)
+
+
+@pytest.fixture(scope="session")
+def sync_client():
+    """
+    WebSocketテスト用の同期版TestClientをセッション全体で共有するFixture。
+
+    備考:
+    - httpx.AsyncClient (ASGITransport) はWebSocketに対応していないため、
+      /ws/status の検証にはこちらを使用する
+    - with文で開始しないため lifespan (init_db 等) は実行されない
+    """
+    return TestClient(app)
+
+
+@pytest_asyncio.fixture
+async def client(asgi_transport, override_get_db):
     """
-    FastAPIテストクライアントを提供するFixture。
+    共有ASGITransportを利用する非同期HTTPクライアントを提供するFixture。
 
     特徴:
     - override_get_dbと組み合わせることで、temp_dbを使用したAPIテストが可能
-    - 同期的なTestClientを使用（シンプルなAPIテスト向け）
+    - イベントループをブロックしないhttpx.AsyncClientを使用
+    - BackgroundTasksはレスポンス返却前に完了する
 
     使用例:
-    def test_api(client):
-        response = client.post("/api/scan")
+    async def test_api(client):
+        response = await client.get("/api/settings")
         assert response.status_code == 200
     """
-    return TestClient(app)
+    async with AsyncClient(transport=asgi_transport, base_url="http://test") as ac:
+        yield ac
 
 
 @pytest.fixture
@@ -188,6 +270,36 @@ def temp_fs():
     shutil.rmtree(tmp_dir)
 
 
+@pytest.fixture
+def make_track():
+    """
+    テスト用Trackを生成するファクトリFixture (DBへの追加は行わない)。
+
+    目的:
+    name から file_path / relative_path / file_name を組み立て、
+    各テストで同じキーワード引数を繰り返し書かなくて済むようにする。
+
+    使用例:
+        def test_example(temp_db, make_track):
+            t1 = make_track("song1", title="Song 1", sync=True)
+            # -> file_path="/music/song1.mp3", relative_path="song1.mp3",
+            #    file_name="song1"
+            temp_db.add(t1)
+    """
+    from backend.db.models import Track
+
+    def _make_track(name, **overrides):
+        fields = {
+            "file_path": f"/music/{name}.mp3",
+            "relative_path": f"{name}.mp3",
+            "file_name": name,
+        }
+        fields.update(overrides)
+        return Track(**fields)
+
+    return _make_track
+
+
 @pytest.fixture
 def create_settings(temp_db):
     """
@@ -298,30 +410,26 @@ def patch_init_db():
         yield
 
 
-@pytest_asyncio.fixture
-async def temp_art_db():
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def art_db_engine():
     """
-    アルバムアート用DBのテスト用セッションFixture
+    アルバムアート用DBのエンジン (db_engine とは別個のインメモリDB)。
+    テーブル作成はセッションで1回のみ。
     """
     from backend.db.albumart_models import Base as ArtBase
-    
-    # 別個のインメモリDB
-    engine = create_async_engine(
-        SQLALCHEMY_DATABASE_URL,
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
 
-    async with engine.begin() as conn:
-        await conn.run_sync(ArtBase.metadata.create_all)
+    engine = await _create_test_engine(ArtBase.metadata)
+    yield engine
+    await engine.dispose()
 
-    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
-    async with async_session() as session:
+@pytest_asyncio.fixture
+async def temp_art_db(art_db_engine):
+    """
+    アルバムアート用DBのテスト用セッションFixture (テスト終了時にロールバック)
+    """
+    async with _rollback_session(art_db_engine) as session:
         yield session
-        await session.close()
-
-    await engine.dispose()
 
 
 @pytest_asyncio.fixture(autouse=True)
@@ -26,10 +26,10 @@ async def test_api_get_album_art(client, temp_art_db):
     await temp_art_db.commit()
     
     # Test valid
-    response = client.get("/api/album-arts/TestAlbum")
+    response = await client.get("/api/album-arts/TestAlbum")
     assert response.status_code == 200
     assert response.content == b"real_image_bytes"
     
     # Test not found
-    response = client.get("/api/album-arts/Unknown")
+    response = await client.get("/api/album-arts/Unknown")
     assert response.status_code == 404
@@ -27,7 +27,7 @@ async def test_api_flow_update_settings(client, temp_db):
     # APIは1つずつ更新する仕様: PUT /api/settings Body: SettingModel
     for key, value in new_settings.items():
         payload = {"key": key, "value": value}
-        response = client.put("/api/settings", json=payload)
+        response = await client.put("/api/settings", json=payload)
         assert response.status_code == 200, f"Failed to update {key}"
 
     # 2. 検証
@@ -61,7 +61,7 @@ async def test_api_flow_manual_scan(client, patch_db_session):
 
         # Note: BackgroundTasks wont run immediately in TestClient unless we wait or force it?
         # Actually Starlette TestClient runs background tasks after response.
-        response = client.post("/api/scan")
+        response = await client.post("/api/scan")
 
         assert response.status_code == 200
         # Check calling
@@ -81,7 +81,7 @@ async def test_api_flow_manual_sync(client, patch_db_session):
     2. SyncService.run_sync() が呼び出されること
     """
     with patch("backend.api.system.SyncService.run_sync") as mock_run_sync:
-        response = client.post("/api/sync")
+        response = await client.post("/api/sync")
 
         assert response.status_code == 200
         mock_run_sync.assert_called_once()
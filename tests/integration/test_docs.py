@@ -1,21 +1,9 @@
 import pytest
-import pytest_asyncio
-from httpx import ASGITransport, AsyncClient
-
-from backend.main import app
 
 # Integration Test: API Documentation
 # 目的: Swagger UIとOpenAPI仕様が正しく公開されているか検証する。
 
 
-@pytest_asyncio.fixture(scope="function")
-async def client():
-    async with AsyncClient(
-        transport=ASGITransport(app=app), base_url="http://test"
-    ) as ac:
-        yield ac
-
-
 @pytest.mark.asyncio
 async def test_swagger_ui(client):
     """
@@ -10,42 +10,20 @@ Integration Test: Playlists API Flow
 
 import pytest
 import pytest_asyncio
-from sqlalchemy import delete
-
-from backend.db.models import Playlist, PlaylistTrack, Track
 
 
 @pytest_asyncio.fixture(scope="function")
-async def seed_data(temp_db):
+async def seed_data(temp_db, make_track):
     """テスト用のトラックとプレイリストをセットアップ"""
 
-    # 既存データクリア
-    await temp_db.execute(delete(PlaylistTrack))
-    await temp_db.execute(delete(Playlist))
-    await temp_db.execute(delete(Track))
+    # temp_db はテストごとにロールバックされるため、既存データのクリアは不要
 
     # トラック作成
-    t1 = Track(
-        file_path="/music/track1.mp3",
-        relative_path="track1.mp3",
-        file_name="track1.mp3",
-        title="Track 1",
-        artist="Artist 1",
-        sync=True,
-    )
-    t2 = Track(
-        file_path="/music/track2.mp3",
-        relative_path="track2.mp3",
-        file_name="track2.mp3",
-        title="Track 2",
-        artist="Artist 2",
-        sync=False,
-    )
-    temp_db.add(t1)
-    temp_db.add(t2)
-    await temp_db.commit()
-    await temp_db.refresh(t1)
-    await temp_db.refresh(t2)
+    t1 = make_track("track1", title="Track 1", artist="Artist 1", sync=True)
+    t2 = make_track("track2", title="Track 2", artist="Artist 2", sync=False)
+    temp_db.add_all([t1, t2])
+    # APIも同じ temp_db セッションを使うため flush で十分。flush 時点で id も採番される
+    await temp_db.flush()
 
     return {"tracks": [t1, t2]}
 
@@ -63,7 +41,7 @@ async def test_create_playlist(client, seed_data):
     2. レスポンスに id, name が含まれること
     3. tracks は空リストであること
     """
-    response = client.post("/api/playlists", json={"name": "Test Playlist"})
+    response = await client.post("/api/playlists", json={"name": "Test Playlist"})
     assert response.status_code == 200
     data = response.json()
     assert data["name"] == "Test Playlist"
@@ -83,8 +61,8 @@ async def test_create_duplicate_playlist(client, seed_data):
     1. 2回目はステータスコード 400 が返ること
     2. エラーメッセージに「既に使用されています」が含まれること
     """
-    client.post("/api/playlists", json={"name": "Duplicate"})
-    response = client.post("/api/playlists", json={"name": "Duplicate"})
+    await client.post("/api/playlists", json={"name": "Duplicate"})
+    response = await client.post("/api/playlists", json={"name": "Duplicate"})
     assert response.status_code == 400
     assert "既に使用されています" in response.json()["detail"]
 
@@ -103,10 +81,10 @@ async def test_get_playlists(client, seed_data):
     2. 作成したプレイリストが全て取得できること
     """
     # プレイリスト作成
-    client.post("/api/playlists", json={"name": "Playlist 1"})
-    client.post("/api/playlists", json={"name": "Playlist 2"})
+    await client.post("/api/playlists", json={"name": "Playlist 1"})
+    await client.post("/api/playlists", json={"name": "Playlist 2"})
 
-    response = client.get("/api/playlists")
+    response = await client.get("/api/playlists")
     assert response.status_code == 200
     data = response.json()
     assert len(data) >= 2
@@ -128,10 +106,10 @@ async def test_get_playlist_by_id(client, seed_data):
     1. ステータスコード 200 が返ること
     2. 作成したプレイリストの情報が取得できること
     """
-    create_response = client.post("/api/playlists", json={"name": "Detail Test"})
+    create_response = await client.post("/api/playlists", json={"name": "Detail Test"})
     playlist_id = create_response.json()["id"]
 
-    response = client.get(f"/api/playlists/{playlist_id}")
+    response = await client.get(f"/api/playlists/{playlist_id}")
     assert response.status_code == 200
     data = response.json()
     assert data["name"] == "Detail Test"
@@ -149,7 +127,7 @@ async def test_get_nonexistent_playlist(client, seed_data):
     期待値:
     1. ステータスコード 404 が返ること
     """
-    response = client.get("/api/playlists/9999")
+    response = await client.get("/api/playlists/9999")
     assert response.status_code == 404
 
 
@@ -166,14 +144,16 @@ async def test_update_playlist_name(client, seed_data):
     1. ステータスコード 200 が返ること
     2. GET で取得したプレイリスト名が更新されていること
     """
-    create_response = client.post("/api/playlists", json={"name": "Old Name"})
+    create_response = await client.post("/api/playlists", json={"name": "Old Name"})
     playlist_id = create_response.json()["id"]
 
-    response = client.put(f"/api/playlists/{playlist_id}", json={"name": "New Name"})
+    response = await client.put(
+        f"/api/playlists/{playlist_id}", json={"name": "New Name"}
+    )
     assert response.status_code == 200
 
     # 確認
-    get_response = client.get(f"/api/playlists/{playlist_id}")
+    get_response = await client.get(f"/api/playlists/{playlist_id}")
     assert get_response.json()["name"] == "New Name"
 
 
@@ -190,14 +170,14 @@ async def test_delete_playlist(client, seed_data):
     1. ステータスコード 200 が返ること
     2. 削除後に GET すると 404 が返ること
     """
-    create_response = client.post("/api/playlists", json={"name": "To Delete"})
+    create_response = await client.post("/api/playlists", json={"name": "To Delete"})
     playlist_id = create_response.json()["id"]
 
-    response = client.delete(f"/api/playlists/{playlist_id}")
+    response = await client.delete(f"/api/playlists/{playlist_id}")
     assert response.status_code == 200
 
     # 削除確認
-    get_response = client.get(f"/api/playlists/{playlist_id}")
+    get_response = await client.get(f"/api/playlists/{playlist_id}")
     assert get_response.status_code == 404
 
 
@@ -218,19 +198,19 @@ async def test_add_tracks_to_playlist(client, seed_data):
     tracks = seed_data["tracks"]
 
     # プレイリスト作成
-    create_response = client.post("/api/playlists", json={"name": "With Tracks"})
+    create_response = await client.post("/api/playlists", json={"name": "With Tracks"})
     playlist_id = create_response.json()["id"]
 
     # 曲を追加
     track_ids = [t.id for t in tracks]
-    response = client.put(
+    response = await client.put(
         f"/api/playlists/{playlist_id}/tracks", json={"track_ids": track_ids}
     )
     assert response.status_code == 200
     assert response.json()["track_count"] == 2
 
     # 確認
-    get_response = client.get(f"/api/playlists/{playlist_id}")
+    get_response = await client.get(f"/api/playlists/{playlist_id}")
     playlist_data = get_response.json()
     assert len(playlist_data["tracks"]) == 2
     assert playlist_data["tracks"][0]["order"] == 0
@@ -253,21 +233,23 @@ async def test_reorder_playlist_tracks(client, seed_data):
     tracks = seed_data["tracks"]
 
     # プレイリスト作成と曲追加
-    create_response = client.post("/api/playlists", json={"name": "Reorder Test"})
+    create_response = await client.post("/api/playlists", json={"name": "Reorder Test"})
     playlist_id = create_response.json()["id"]
 
     track_ids = [t.id for t in tracks]
-    client.put(f"/api/playlists/{playlist_id}/tracks", json={"track_ids": track_ids})
+    await client.put(
+        f"/api/playlists/{playlist_id}/tracks", json={"track_ids": track_ids}
+    )
 
     # 順序を逆にする
     reversed_ids = list(reversed(track_ids))
-    response = client.put(
+    response = await client.put(
         f"/api/playlists/{playlist_id}/tracks", json={"track_ids": reversed_ids}
     )
     assert response.status_code == 200
 
     # 確認
-    get_response = client.get(f"/api/playlists/{playlist_id}")
+    get_response = await client.get(f"/api/playlists/{playlist_id}")
     playlist_data = get_response.json()
     assert playlist_data["tracks"][0]["track_id"] == reversed_ids[0]
     assert playlist_data["tracks"][1]["track_id"] == reversed_ids[1]
@@ -290,21 +272,23 @@ async def test_remove_tracks_from_playlist(client, seed_data):
     tracks = seed_data["tracks"]
 
     # プレイリスト作成と曲追加
-    create_response = client.post("/api/playlists", json={"name": "Remove Test"})
+    create_response = await client.post("/api/playlists", json={"name": "Remove Test"})
     playlist_id = create_response.json()["id"]
 
     track_ids = [t.id for t in tracks]
-    client.put(f"/api/playlists/{playlist_id}/tracks", json={"track_ids": track_ids})
+    await client.put(
+        f"/api/playlists/{playlist_id}/tracks", json={"track_ids": track_ids}
+    )
 
     # 1つだけ残す
-    response = client.put(
+    response = await client.put(
         f"/api/playlists/{playlist_id}/tracks", json={"track_ids": [track_ids[0]]}
     )
     assert response.status_code == 200
     assert response.json()["track_count"] == 1
 
     # 確認
-    get_response = client.get(f"/api/playlists/{playlist_id}")
+    get_response = await client.get(f"/api/playlists/{playlist_id}")
     playlist_data = get_response.json()
     assert len(playlist_data["tracks"]) == 1
 
@@ -326,21 +310,23 @@ async def test_clear_playlist_tracks(client, seed_data):
     tracks = seed_data["tracks"]
 
     # プレイリスト作成と曲追加
-    create_response = client.post("/api/playlists", json={"name": "Clear Test"})
+    create_response = await client.post("/api/playlists", json={"name": "Clear Test"})
     playlist_id = create_response.json()["id"]
 
     track_ids = [t.id for t in tracks]
-    client.put(f"/api/playlists/{playlist_id}/tracks", json={"track_ids": track_ids})
+    await client.put(
+        f"/api/playlists/{playlist_id}/tracks", json={"track_ids": track_ids}
+    )
 
     # 全削除
-    response = client.put(
+    response = await client.put(
         f"/api/playlists/{playlist_id}/tracks", json={"track_ids": []}
     )
     assert response.status_code == 200
     assert response.json()["track_count"] == 0
 
     # 確認
-    get_response = client.get(f"/api/playlists/{playlist_id}")
+    get_response = await client.get(f"/api/playlists/{playlist_id}")
     playlist_data = get_response.json()
     assert len(playlist_data["tracks"]) == 0
 
@@ -358,10 +344,12 @@ async def test_add_invalid_track_ids(client, seed_data):
     1. ステータスコード 400 が返ること
     2. エラーメッセージに「存在しないトラックID」が含まれること
     """
-    create_response = client.post("/api/playlists", json={"name": "Invalid Tracks"})
+    create_response = await client.post(
+        "/api/playlists", json={"name": "Invalid Tracks"}
+    )
     playlist_id = create_response.json()["id"]
 
-    response = client.put(
+    response = await client.put(
         f"/api/playlists/{playlist_id}/tracks", json={"track_ids": [9999, 10000]}
     )
     assert response.status_code == 400
@@ -24,7 +24,7 @@ async def test_get_settings_empty(client):
     1. ステータスコード 200 が返ること
     2. 空のリスト [] が返ること
     """
-    response = client.get("/api/settings")
+    response = await client.get("/api/settings")
     assert response.status_code == 200
     assert response.json() == []
 
@@ -42,13 +42,13 @@ async def test_update_setting(client):
     2. レスポンスに status: ok が含まれること
     3. GET で取得したデータに追加した設定が含まれること
     """
-    response = client.put(
+    response = await client.put(
         "/api/settings", json={"key": "test_key", "value": "test_val"}
     )
     assert response.status_code == 200
     assert response.json()["status"] == "ok"
 
-    response = client.get("/api/settings")
+    response = await client.get("/api/settings")
     assert response.status_code == 200
     data = response.json()
     assert len(data) == 1
@@ -70,18 +70,56 @@ async def test_update_existing_setting(client):
     2. GET で取得した値が更新後の値になっていること
     """
     # Setup initial state
-    client.put("/api/settings", json={"key": "test_key", "value": "initial_val"})
+    await client.put(
+        "/api/settings", json={"key": "test_key", "value": "initial_val"}
+    )
 
-    response = client.put(
+    response = await client.put(
         "/api/settings", json={"key": "test_key", "value": "updated_val"}
     )
     assert response.status_code == 200
 
-    response = client.get("/api/settings")
+    response = await client.get("/api/settings")
     data = response.json()
     assert data[0]["value"] == "updated_val"
 
 
+@pytest.mark.asyncio
+async def test_bulk_update_settings(client, temp_db):
+    """
+    [Settings API] 設定の一括追加・更新
+
+    条件:
+    1. 既存の設定が1件存在する
+    2. 既存キーと新規キーを含むリストで PUT /api/settings/bulk を実行
+
+    期待値:
+    1. ステータスコード 200 が返ること
+    2. 既存キーの値が更新されていること
+    3. 新規キーが追加されていること
+    """
+    temp_db.add(Setting(key="sync_mode", value="adb"))
+    await temp_db.commit()
+
+    response = await client.put(
+        "/api/settings/bulk",
+        json=[
+            {"key": "sync_mode", "value": "ftp"},
+            {"key": "ftp_host", "value": "192.168.0.10"},
+            {"key": "ftp_port", "value": "2221"},
+        ],
+    )
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok", "updated_count": 3}
+
+    result = await temp_db.execute(select(Setting.key, Setting.value))
+    assert dict(result.all()) == {
+        "sync_mode": "ftp",
+        "ftp_host": "192.168.0.10",
+        "ftp_port": "2221",
+    }
+
+
 @pytest.mark.asyncio
 async def test_get_public_key_generate_new(client, temp_db):
     """
@@ -145,7 +183,7 @@ async def test_get_public_key_generate_new(client, temp_db):
             mock_run.side_effect = side_effect
 
             # API実行
-            response = client.get("/api/settings/ssh-key/public")
+            response = await client.get("/api/settings/ssh-key/public")
 
             # 検証
             assert response.status_code == 200
@@ -200,7 +238,7 @@ async def test_get_public_key_existing(client):
             patch("subprocess.run") as mock_run,
         ):
             # API実行
-            response = client.get("/api/settings/ssh-key/public")
+            response = await client.get("/api/settings/ssh-key/public")
 
             # 検証
             assert response.status_code == 200
@@ -1,5 +1,6 @@
+import ftplib
 import os
-from unittest.mock import patch
+from unittest.mock import MagicMock, call, patch
 
 import pytest
 
@@ -10,8 +11,15 @@ from backend.db.models import Track
 # 目的: DBの状態と設定に基づいて、適切な同期コマンドが発行されるか検証する。
 
 
-async def create_track(db, file_path, relative_path, sync=True, file_name="file.mp3"):
-    """テスト用トラック作成ヘルパー"""
+async def create_track(
+    db, file_path, relative_path, sync=True, file_name="file.mp3", commit=False
+):
+    """
+    テスト用トラック作成ヘルパー
+
+    トラックはセッションに追加するのみで、commit=True の場合だけコミットする。
+    複数件作成する場合は最後に1回だけコミットすること。
+    """
     filtered_rel_path = relative_path.lstrip("/")  # Ensure relative path is relative
     t = Track(
         file_path=file_path,
@@ -20,12 +28,15 @@ async def create_track(db, file_path, relative_path, sync=True, file_name="file.
         sync=sync,
     )
     db.add(t)
-    await db.commit()
+    if commit:
+        await db.commit()
     return t
 
 
 @pytest.mark.asyncio
-async def test_syncer_flow_adb(temp_db, create_settings, patch_db_session):
+async def test_syncer_flow_adb(
+    temp_db, create_settings, patch_db_session, inline_threadpool
+):
     """
     [Syncer] ADB同期フロー
 
@@ -59,50 +70,49 @@ async def test_syncer_flow_adb(temp_db, create_settings, patch_db_session):
         sync=False,
         file_name="song2.mp3",
     )
+    await temp_db.commit()
 
     # 3. モック準備 & 実行
     # run_in_threadpool: 同期関数を非同期で呼ぶラッパーを無効化（即時実行）
-    # subprocess.run: 実際のコマンド実行を阻止して検証
+    # subprocess.run: 実際のコマンド実行を阻止し、push を 転送元 -> 転送先 で記録する
+    pushes = {}
+
+    def record_run(cmd, *args, **kwargs):
+        if isinstance(cmd, list) and cmd[:2] == ["adb", "push"]:
+            pushes[cmd[2]] = cmd[3]
+        # ADB ls (初期チェック) は既存ファイルなし
+        return MagicMock(returncode=0, stdout="", stderr="")
+
     with (
-        patch(
-            "backend.core.syncer.run_in_threadpool",
-            side_effect=lambda f, *args: f(*args),
-        ),
-        patch("subprocess.run") as mock_run,
+        inline_threadpool("backend.core.syncer.run_in_threadpool"),
+        patch("subprocess.run", side_effect=record_run),
     ):
-        # ADB ls (初期チェック) のモック
-        mock_run.return_value.returncode = 0
-        mock_run.return_value.stdout = ""  # 既存ファイルなし
-        mock_run.return_value.stderr = ""
-
         # 実行
         await SyncService.run_sync()
 
-        # 4. 検証
-        # pushコマンドが呼ばれたか確認
-        push_calls = [c for c in mock_run.call_args_list if "push" in str(c)]
-
-        # song1.mp3 は転送されるべき
-        song1_pushed = any(
-            "/local/Artist/Album/song1.mp3" in str(c) for c in push_calls
-        )
-        assert song1_pushed, "song1.mp3 should be pushed via ADB"
+    # 4. 検証
+    # song1.mp3 は転送されるべき
+    assert "/local/Artist/Album/song1.mp3" in pushes, (
+        "song1.mp3 should be pushed via ADB"
+    )
 
-        # song2.mp3 は転送されるべきではない
-        song2_pushed = any(
-            "/local/Artist/Album/song2.mp3" in str(c) for c in push_calls
-        )
-        assert not song2_pushed, "song2.mp3 (sync=False) should NOT be pushed"
+    # song2.mp3 は転送されるべきではない
+    assert "/local/Artist/Album/song2.mp3" not in pushes, (
+        "song2.mp3 (sync=False) should NOT be pushed"
+    )
 
-        # パスの結合が正しいか確認 (DEST + Relative)
-        # 期待: /sdcard/Music/Artist/Album/song1.mp3
-        expected_dest = "/sdcard/Music/Artist/Album/song1.mp3"
-        dest_check = any(expected_dest in str(c) for c in push_calls)
-        assert dest_check, f"Destination path should confirm to {expected_dest}"
+    # パスの結合が正しいか確認 (DEST + Relative)
+    # 期待: /sdcard/Music/Artist/Album/song1.mp3
+    expected_dest = "/sdcard/Music/Artist/Album/song1.mp3"
+    assert pushes["/local/Artist/Album/song1.mp3"] == expected_dest, (
+        f"Destination path should confirm to {expected_dest}"
+    )
 
 
 @pytest.mark.asyncio
-async def test_syncer_flow_rsync(temp_db, create_settings, patch_db_session):
+async def test_syncer_flow_rsync(
+    temp_db, create_settings, patch_db_session, inline_threadpool
+):
     """
     [Syncer] Rsync同期フロー
 
@@ -129,15 +139,16 @@ async def test_syncer_flow_rsync(temp_db, create_settings, patch_db_session):
 
     # 2. データ準備
     await create_track(
-        temp_db, "/local/music/Artist/song1.mp3", "Artist/song1.mp3", sync=True
+        temp_db,
+        "/local/music/Artist/song1.mp3",
+        "Artist/song1.mp3",
+        sync=True,
+        commit=True,
     )
 
     # 3. モック準備 & 実行
     with (
-        patch(
-            "backend.core.syncer.run_in_threadpool",
-            side_effect=lambda f, *args: f(*args),
-        ),
+        inline_threadpool("backend.core.syncer.run_in_threadpool"),
         patch("subprocess.Popen") as mock_popen,
         patch("subprocess.run"),
     ):  # For mkdir/cp commands if any
@@ -175,3 +186,74 @@ async def test_syncer_flow_rsync(temp_db, create_settings, patch_db_session):
         # 実際には一時ファイルはもう消えているかもしれないが、
         # コードの挙動として正しい引数が渡っているかを確認
         assert "tmp" in include_file_path or os.path.sep in include_file_path
+
+
+@pytest.mark.asyncio
+async def test_syncer_flow_ftp_mocked(
+    temp_db, temp_fs, create_settings, patch_db_session, inline_threadpool
+):
+    """
+    [Syncer] FTP同期フロー (ftplib.FTP をモック)
+
+    条件:
+    1. 同期モードが 'ftp'、同期先が /Music
+    2. 同期対象ファイル(sync=True) と 同期対象外ファイル(sync=False) がDBに存在する
+    3. リモートには何も存在しない
+
+    期待値:
+    1. 設定したホスト/ポートへ接続し、ログインすること
+    2. ネストしたディレクトリが上位から順に MKD されること
+    3. 同期対象ファイルのみが対象ディレクトリで STOR されること
+    """
+    # 1. 設定
+    await create_settings(
+        sync_mode="ftp",
+        sync_dest="/Music",
+        ftp_host="127.0.0.1",
+        ftp_port="2121",
+        ftp_user="user",
+        ftp_pass="pass",
+    )
+
+    # 2. データ準備 (open() するため temp_fs 上の実ファイルを使う)
+    await create_track(
+        temp_db,
+        os.path.join(temp_fs, "Artist1", "Album1", "song1.mp3"),
+        "Artist1/Album1/song1.mp3",
+        sync=True,
+        file_name="song1.mp3",
+    )
+    await create_track(
+        temp_db,
+        os.path.join(temp_fs, "Artist1", "Album1", "song2.mp3"),
+        "Artist1/Album1/song2.mp3",
+        sync=False,
+        file_name="song2.mp3",
+    )
+    await temp_db.commit()
+
+    # 3. モック準備 & 実行
+    with (
+        inline_threadpool("backend.core.syncer.run_in_threadpool"),
+        patch("backend.core.syncer.ftplib.FTP") as mock_ftp_cls,
+    ):
+        mock_ftp = mock_ftp_cls.return_value
+        mock_ftp.mlsd.return_value = []  # リモートは空
+        mock_ftp.sendcmd.side_effect = ftplib.error_perm("550 Not found")  # MLST
+
+        await SyncService.run_sync()
+
+    # 4. 検証
+    mock_ftp.connect.assert_called_once_with(host="127.0.0.1", port=2121)
+    mock_ftp.login.assert_called_once_with(user="user", passwd="pass")
+
+    mkd_paths = [c.args[0] for c in mock_ftp.mkd.call_args_list]
+    expected_dirs = ["Music", "Music/Artist1", "Music/Artist1/Album1"]
+    assert [p for p in mkd_paths if p in expected_dirs] == expected_dirs
+
+    stor_cmds = [c.args[0] for c in mock_ftp.storbinary.call_args_list]
+    assert "STOR song1.mp3" in stor_cmds
+    assert "STOR song2.mp3" not in stor_cmds
+
+    # STOR 直前に対象ディレクトリへ移動していること
+    assert call.cwd("Music/Artist1/Album1") in mock_ftp.mock_calls
@@ -2,8 +2,6 @@ import os
 import shutil
 import tempfile
 import threading
-import time
-from unittest.mock import patch
 
 import pytest
 from pyftpdlib.authorizers import DummyAuthorizer
@@ -15,6 +13,9 @@ from backend.db.models import Track
 
 # Integration Test: FTP Syncer Flow
 # 目的: SyncServiceを使って、実際のFTPサーバーへの転送フローを検証する。
+# 備考: 実サーバーを起動するため slow マーカーを付与し、デフォルト実行からは除外する。
+#       (`pytest -m slow` で実行)。FTP呼び出しの検証は test_syncer_flow.py の
+#       test_syncer_flow_ftp_mocked で行う。
 
 
 class QuietFTPHandler(FTPHandler):
@@ -30,10 +31,10 @@ class QuietFTPHandler(FTPHandler):
         pass
 
 
-@pytest.fixture
-def ftp_server():
+@pytest.fixture(scope="module")
+def ftp_server_process():
     """
-    一時的なFTPサーバーを別スレッドで起動するFixture。
+    一時的なFTPサーバーを別スレッドで起動するFixture (モジュール内で共有)。
     戻り値として (server_root, ftp_port, ftp_user, ftp_pass) を返す。
     """
     ftp_user = "testuser"
@@ -49,17 +50,15 @@ def ftp_server():
     handler.authorizer = authorizer
 
     # ポート0で動的割り当て
+    # FTPServerはコンストラクタ内でbind/listenまで完了するため、
+    # serve_forever開始前でもポート番号を取得でき、接続もバックログに積まれる
     server = FTPServer(("127.0.0.1", 0), handler)
+    actual_port = server.socket.getsockname()[1]
 
     server_thread = threading.Thread(target=server.serve_forever)
     server_thread.daemon = True
     server_thread.start()
 
-    # 起動待機
-    time.sleep(0.5)
-
-    actual_port = server.socket.getsockname()[1]
-
     yield server_root, actual_port, ftp_user, ftp_password
 
     # Teardown
@@ -70,8 +69,34 @@ def ftp_server():
     server_thread.join(timeout=2.0)
 
 
-async def create_track(db, file_path, relative_path, sync=True, file_name="file.mp3"):
-    """テスト用トラック作成ヘルパー (SyncServiceで読み込まれる用)"""
+@pytest.fixture
+def ftp_server(ftp_server_process):
+    """
+    共有FTPサーバー上にテスト専用のディレクトリを払い出すFixture。
+    戻り値として (local_dir, remote_dir, ftp_port, ftp_user, ftp_pass) を返す。
+
+    - local_dir: テスト専用ディレクトリのローカルパス (転送結果の検証用)
+    - remote_dir: 同ディレクトリのFTP上のパス (sync_dest に指定する)
+    """
+    server_root, ftp_port, ftp_user, ftp_pass = ftp_server_process
+
+    local_dir = tempfile.mkdtemp(dir=server_root)
+    remote_dir = "/" + os.path.basename(local_dir)
+
+    yield local_dir, remote_dir, ftp_port, ftp_user, ftp_pass
+
+    shutil.rmtree(local_dir)
+
+
+async def create_track(
+    db, file_path, relative_path, sync=True, file_name="file.mp3", commit=False
+):
+    """
+    テスト用トラック作成ヘルパー (SyncServiceで読み込まれる用)
+
+    トラックはセッションに追加するのみで、commit=True の場合だけコミットする。
+    複数件作成する場合は最後に1回だけコミットすること。
+    """
     t = Track(
         file_path=file_path,
         relative_path=relative_path,  # DB上の相対パス
@@ -79,13 +104,15 @@ async def create_track(db, file_path, relative_path, sync=True, file_name="file.
         sync=sync,
     )
     db.add(t)
-    await db.commit()
+    if commit:
+        await db.commit()
     return t
 
 
+@pytest.mark.slow
 @pytest.mark.asyncio
 async def test_syncer_flow_ftp(
-    temp_db, temp_fs, create_settings, patch_db_session, ftp_server
+    temp_db, temp_fs, create_settings, patch_db_session, ftp_server, inline_threadpool
 ):
     """
     [Syncer] FTP同期フロー
@@ -97,15 +124,15 @@ async def test_syncer_flow_ftp(
 
     期待値:
     1. SyncService.run_sync() がエラーなく完了すること
-    2. FTPサーバーのルートディレクトリに、ディレクトリ構造が維持されてファイルが転送されること
+    2. 同期先ディレクトリに、ディレクトリ構造が維持されてファイルが転送されること
     3. 同期対象外(sync=False)のファイルは転送されないこと
     """
-    server_root, ftp_port, ftp_user, ftp_pass = ftp_server
+    local_dir, remote_dir, ftp_port, ftp_user, ftp_pass = ftp_server
 
     # 1. 設定
     await create_settings(
         sync_mode="ftp",
-        sync_dest="/",  # FTPルート
+        sync_dest=remote_dir,  # テスト専用ディレクトリ
         ftp_host="127.0.0.1",
         ftp_port=ftp_port,
         ftp_user=ftp_user,
@@ -141,25 +168,24 @@ async def test_syncer_flow_ftp(
         sync=False,  # 同期しない
         file_name="song2.mp3",
     )
+    await temp_db.commit()
 
     # 3. 実行
     # run_in_threadpool をバイパスして同期実行させる
-    with patch(
-        "backend.core.syncer.run_in_threadpool", side_effect=lambda f, *args: f(*args)
-    ):
+    with inline_threadpool("backend.core.syncer.run_in_threadpool"):
         await SyncService.run_sync()
 
     # 4. 検証
     # FTPサーバー側のファイル確認
 
-    # 期待されるパス: <server_root>/Artist1/Album1/song1.mp3
-    dest_path_song1 = os.path.join(server_root, "Artist1", "Album1", "song1.mp3")
+    # 期待されるパス: <local_dir>/Artist1/Album1/song1.mp3
+    dest_path_song1 = os.path.join(local_dir, "Artist1", "Album1", "song1.mp3")
     assert os.path.exists(dest_path_song1), (
         "song1.mp3 がFTPサーバーに転送されていること"
     )
 
     # Sync=False の確認
-    dest_path_song2 = os.path.join(server_root, "Artist1", "Album1", "song2.mp3")
+    dest_path_song2 = os.path.join(local_dir, "Artist1", "Album1", "song2.mp3")
     assert not os.path.exists(dest_path_song2), (
         "song2.mp3 (sync=False) は転送されていないこと"
     )
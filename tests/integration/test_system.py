@@ -22,7 +22,7 @@ async def test_scan(client):
     2. レスポンスに status: accepted が含まれること
        (バックグラウンドでスキャン処理が開始されたことを示す)
     """
-    response = client.post("/api/scan")
+    response = await client.post("/api/scan")
     assert response.status_code == 200
     assert response.json()["status"] == "accepted"
 
@@ -40,6 +40,6 @@ async def test_sync(client):
     2. レスポンスに status: accepted が含まれること
        (バックグラウンドで同期処理が開始されたことを示す)
     """
-    response = client.post("/api/sync")
+    response = await client.post("/api/sync")
     assert response.status_code == 200
     assert response.json()["status"] == "accepted"
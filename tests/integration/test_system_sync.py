@@ -1,19 +1,56 @@
+import asyncio
+import queue
+import threading
 import time
 from unittest.mock import patch
 
+import pytest
 from fastapi.concurrency import run_in_threadpool
-from fastapi.testclient import TestClient
 
-from backend.main import app
+from backend.api.websocket import manager
 
 # Integration Test: System Sync WebSocket Streaming
 # 目的: 同期処理中のログがWebSocket経由でリアルタイムに配信されるか検証する。
 
-# Use TestClient for WebSocket support
-client = TestClient(app)
 
-
-def test_sync_log_streaming():
+def _receive_until(websocket, expected, timeout):
+    """
+    expected を受信するか timeout 秒経過するまでメッセージを受信し、
+    受信したメッセージのリストを返す。
+    """
+    received = queue.Queue()
+
+    def _reader():
+        while True:
+            try:
+                msg = websocket.receive_text()
+            except Exception:
+                return
+            received.put(msg)
+            if msg == expected:
+                return
+
+    # タイムアウト時は受信待ちのスレッドが残るため、
+    # インタプリタ終了時に join されないようデーモンスレッドで受信する
+    threading.Thread(target=_reader, daemon=True).start()
+
+    messages = []
+    deadline = time.monotonic() + timeout
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            msg = received.get(timeout=remaining)
+        except queue.Empty:
+            break
+        messages.append(msg)
+        if msg == expected:
+            break
+    return messages
+
+
+def test_sync_log_streaming(sync_client):
     """
     [System API] 同期ログのWebSocketストリーミング
 
@@ -49,40 +86,90 @@ def test_sync_log_streaming():
         mock_run_sync.side_effect = mock_implementation
 
         # Connect to WebSocket
-        with client.websocket_connect("/ws/status") as websocket:
+        with sync_client.websocket_connect("/ws/status") as websocket:
             # Trigger sync via POST
-            response = client.post("/api/sync")
+            response = sync_client.post("/api/sync")
             assert response.status_code == 200
 
-            # Check for messages
-            messages = []
-
-            # Since TestClient is sync, we might need to loop to receive messages
-            # But the app processes the request in background task.
-            # Background tasks in TestClient might run after response?
-            # TestClient context manager handles lifespan.
-
-            # Received messages
-            start_time = time.time()
-            while time.time() - start_time < 2.0:
-                try:
-                    # receive_text might block? TestClient WebSocket receive_text is blocking?
-                    # No, it checks if message available.
-                    # We assume implementation sends it reasonably fast.
-                    # But we need to be careful not to block forever if no message.
-                    # TestClient.websocket_connect returns a WebSocketTestSession.
-                    # receive_text raises generic exception if closed?
-                    # Let's try simple receive.
-                    msg = websocket.receive_text()
-                    messages.append(msg)
-                    if msg == "Sync complete":
-                        break
-                except Exception:
-                    # Maybe no message yet? sleep a bit
-                    time.sleep(0.1)
+            # receive_text はフレームが届くまでブロックするため、
+            # ワーカースレッドで受信してタイムアウト付きで待つ
+            messages = _receive_until(websocket, "Sync complete", timeout=2.0)
 
             print("Received messages:", messages)
 
             # Fails if "Test log message" is missing (which happens if RuntimeError occurred in thread)
             assert "Test log message" in messages
             assert "Sync complete" in messages
+
+
+class _QueueWebSocket:
+    """
+    ConnectionManager に登録する WebSocket の代替。
+    send_text で受け取ったメッセージを asyncio.Queue に積む。
+    """
+
+    def __init__(self):
+        self.queue = asyncio.Queue()
+
+    async def send_text(self, message: str):
+        self.queue.put_nowait(message)
+
+
+async def _collect_until(queue, sentinel, timeout):
+    """
+    sentinel を受信するか timeout 秒経過するまで queue からメッセージを取り出し、
+    受信したメッセージのリストを返す。
+    """
+    messages = []
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            break
+        try:
+            msg = await asyncio.wait_for(queue.get(), timeout=remaining)
+        except asyncio.TimeoutError:
+            break
+        messages.append(msg)
+        if msg == sentinel:
+            break
+    return messages
+
+
+@pytest.mark.asyncio
+async def test_sync_log_broadcast(client):
+    """
+    [System API] 同期ログのブロードキャスト (非同期クライアント)
+
+    条件:
+    1. ConnectionManager にキュー付きの購読者を登録
+    2. POST /api/sync で同期処理を開始
+    3. 同期処理中にスレッドからログコールバックが呼ばれる
+
+    期待値:
+    1. "Test log message" が購読者に配信されること
+    2. "Sync complete" が購読者に配信されること
+    """
+    subscriber = _QueueWebSocket()
+    manager.active_connections.append(subscriber)
+
+    async def mock_implementation(log_callback=None):
+        await run_in_threadpool(log_callback, "Test log message")
+
+    try:
+        with patch(
+            "backend.api.system.SyncService.run_sync",
+            side_effect=mock_implementation,
+        ):
+            response = await client.post("/api/sync")
+            assert response.status_code == 200
+
+            messages = await _collect_until(
+                subscriber.queue, "Sync complete", timeout=2.0
+            )
+    finally:
+        manager.disconnect(subscriber)
+
+    assert "Test log message" in messages
+    assert "Sync complete" in messages
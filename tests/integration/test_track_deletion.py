@@ -5,7 +5,7 @@ from backend.db.models import Track
 
 
 @pytest.mark.asyncio
-async def test_batch_delete_tracks(client, temp_db):
+async def test_batch_delete_tracks(client, temp_db, make_track):
     """
     [Integration - Tracks API] トラック一括削除の動作検証
 
@@ -20,36 +20,17 @@ async def test_batch_delete_tracks(client, temp_db):
     4. 存在しないIDを含んでいてもエラーにならず、存在するIDのものが削除されること
     """
     # 1. Setup Data
-    t1 = Track(
-        file_path="/music/del1.mp3",
-        relative_path="del1.mp3",
-        file_name="del1",
-        title="Delete Me 1",
-        size=1024,
-    )
-    t2 = Track(
-        file_path="/music/del2.mp3",
-        relative_path="del2.mp3",
-        file_name="del2",
-        title="Delete Me 2",
-        size=2048,
-    )
-    t3 = Track(
-        file_path="/music/keep.mp3",
-        relative_path="keep.mp3",
-        file_name="keep",
-        title="Keep Me",
-        size=4096,
-    )
+    t1 = make_track("del1", title="Delete Me 1", size=1024)
+    t2 = make_track("del2", title="Delete Me 2", size=2048)
+    t3 = make_track("keep", title="Keep Me", size=4096)
     temp_db.add_all([t1, t2, t3])
     await temp_db.commit()
-    await temp_db.refresh(t1)
-    await temp_db.refresh(t2)
-    await temp_db.refresh(t3)
 
     # 2. Execute Delete (including non-existent ID 999)
     target_ids = [t1.id, t2.id, 999]
-    response = client.request("DELETE", "/api/tracks/batch", json={"ids": target_ids})
+    response = await client.request(
+        "DELETE", "/api/tracks/batch", json={"ids": target_ids}
+    )
 
     # 3. Verify Response
     assert response.status_code == 200
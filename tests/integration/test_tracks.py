@@ -1,6 +1,6 @@
 import pytest
 import pytest_asyncio
-from sqlalchemy import delete
+from sqlalchemy import select
 
 from backend.db.models import Track
 
@@ -9,30 +9,12 @@ from backend.db.models import Track
 
 
 @pytest_asyncio.fixture(scope="function")
-async def seed_tracks(temp_db):
-    # Clear existing tracks
-    await temp_db.execute(delete(Track))
-
-    t1 = Track(
-        file_path="/music/t1.mp3",
-        relative_path="t1.mp3",
-        file_name="t1",
-        title="Title1",
-        sync=False,
-    )
-    t2 = Track(
-        file_path="/music/t2.mp3",
-        relative_path="t2.mp3",
-        file_name="t2",
-        title="Title2",
-        sync=True,
-    )
-    temp_db.add(t1)
-    temp_db.add(t2)
-    await temp_db.commit()
-    # refresh to get IDs
-    await temp_db.refresh(t1)
-    await temp_db.refresh(t2)
+async def seed_tracks(temp_db, make_track):
+    t1 = make_track("t1", title="Title1", sync=False)
+    t2 = make_track("t2", title="Title2", sync=True)
+    temp_db.add_all([t1, t2])
+    # APIも同じ temp_db セッションを使うため flush で十分。flush 時点で id も採番される
+    await temp_db.flush()
     return [t1, t2]
 
 
@@ -50,19 +32,18 @@ async def test_get_tracks(client, seed_tracks):
     2. 登録した2件のトラックが取得できること
     3. 各トラックのtitle等の情報が正しいこと
     """
-    response = client.get("/api/tracks")
+    response = await client.get("/api/tracks")
     assert response.status_code == 200
     data = response.json()
     assert len(data) >= 2  # could be more if other tests ran? no scope function
 
-    # Sort by ID to ensure order
-    data.sort(key=lambda x: x["id"])
-    assert data[0]["title"] == "Title1"
-    assert data[1]["title"] == "Title2"
+    by_id = {x["id"]: x for x in data}
+    assert by_id[seed_tracks[0].id]["title"] == "Title1"
+    assert by_id[seed_tracks[1].id]["title"] == "Title2"
 
 
 @pytest.mark.asyncio
-async def test_update_track(client, seed_tracks):
+async def test_update_track(client, temp_db, seed_tracks):
     """
     [Tracks API] トラック個別更新
 
@@ -73,22 +54,20 @@ async def test_update_track(client, seed_tracks):
     期待値:
     1. ステータスコード 200 が返ること
     2. レスポンスに status: ok が含まれること
-    3. GET で取得した該当トラックのsyncがTrueになっていること
+    3. DB上の該当トラックのsyncがTrueになっていること
     """
     t1 = seed_tracks[0]
-    response = client.put(f"/api/tracks/{t1.id}", json={"sync": True})
+    response = await client.put(f"/api/tracks/{t1.id}", json={"sync": True})
     assert response.status_code == 200
     assert response.json()["status"] == "ok"
 
-    # Verify
-    response = client.get("/api/tracks")
-    data = response.json()
-    updated = next(x for x in data if x["id"] == t1.id)
-    assert updated["sync"]
+    # Verify (APIを経由せずDBの値を直接確認する)
+    await temp_db.refresh(t1)
+    assert t1.sync is True
 
 
 @pytest.mark.asyncio
-async def test_batch_update(client, seed_tracks):
+async def test_batch_update(client, temp_db, seed_tracks):
     """
     [Tracks API] トラック一括更新
 
@@ -98,14 +77,16 @@ async def test_batch_update(client, seed_tracks):
 
     期待値:
     1. ステータスコード 200 が返ること
-    2. GET で取得した指定トラック全てのsyncがTrueになっていること
+    2. DB上の指定トラック全てのsyncがTrueになっていること
     """
     ids = [t.id for t in seed_tracks]
-    response = client.put("/api/tracks/batch", json={"ids": ids, "sync": True})
+    response = await client.put("/api/tracks/batch", json={"ids": ids, "sync": True})
     assert response.status_code == 200, response.json()
 
-    response = client.get("/api/tracks")
-    data = response.json()
-    for item in data:
-        if item["id"] in ids:
-            assert item["sync"]
+    # Verify (APIを経由せずDBの値を直接確認する)
+    result = await temp_db.execute(
+        select(Track).where(Track.id.in_(ids)).execution_options(populate_existing=True)
+    )
+    rows = result.scalars().all()
+    assert len(rows) == len(ids)
+    assert all(r.sync for r in rows)
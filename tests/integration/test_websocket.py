@@ -1,12 +1,8 @@
-from fastapi.testclient import TestClient
-
-from backend.main import app
-
 # Integration Test: WebSocket
 # 目的: WebSocketエンドポイント(/ws/status)への接続が正常に確立されるか検証する。
 
 
-def test_websocket():
+def test_websocket(sync_client):
     """
     [WebSocket] 接続確立確認
 
@@ -21,7 +17,6 @@ def test_websocket():
     この検証により、WebSocketエンドポイントが正しく設定されており、
     クライアントからの接続を受け付けられることを確認する。
     """
-    client = TestClient(app)
-    with client.websocket_connect("/ws/status") as websocket:
+    with sync_client.websocket_connect("/ws/status") as websocket:
         # Just connect check
         pass
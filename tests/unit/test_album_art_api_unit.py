@@ -1,12 +1,12 @@
 
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock
 import pytest
 from fastapi import HTTPException
 from backend.api.album_art import get_album_art
 from backend.db.albumart_models import AlbumArt
 
 @pytest.mark.asyncio
-async def test_get_album_art_found():
+async def test_get_album_art_found(fake_result):
     """
     [API] アルバムアート取得 (正常系)
     
@@ -26,8 +26,7 @@ async def test_get_album_art_found():
         source_type="file"
     )
     
-    mock_result = MagicMock()
-    mock_result.scalars().first.return_value = existing
+    mock_result = fake_result(existing)
     mock_db.execute.return_value = mock_result
     
     response = await get_album_art("TestAlbum", db=mock_db)
@@ -36,7 +35,7 @@ async def test_get_album_art_found():
     assert response.media_type == "image/jpeg"
 
 @pytest.mark.asyncio
-async def test_get_album_art_not_found():
+async def test_get_album_art_not_found(fake_result):
     """
     [API] アルバムアート取得 (404)
     
@@ -48,8 +47,7 @@ async def test_get_album_art_not_found():
     """
     mock_db = AsyncMock()
     
-    mock_result = MagicMock()
-    mock_result.scalars().first.return_value = None
+    mock_result = fake_result()
     mock_db.execute.return_value = mock_result
     
     with pytest.raises(HTTPException) as exc:
@@ -1,13 +1,13 @@
 import os
 import unittest
-from unittest.mock import MagicMock, patch, AsyncMock
+from unittest.mock import MagicMock, AsyncMock
 import pytest
 from backend.core.album_art_scanner import AlbumArtScanner
 from backend.db.models import Track
 from backend.db.albumart_models import AlbumArt
 
 @pytest.mark.asyncio
-async def test_album_scanner_priority():
+async def test_album_scanner_priority(inline_threadpool, fake_result):
     """
     [Scanner] 優先順位のテスト
     
@@ -30,8 +30,7 @@ async def test_album_scanner_priority():
     scanner._find_source = AsyncMock(side_effect=mock_find_source) 
     
     # run_in_threadpoolのモック
-    with patch("backend.core.album_art_scanner.run_in_threadpool", new_callable=AsyncMock) as mock_run:
-        mock_run.side_effect = lambda func, *args: func(*args) if callable(func) else None
+    with inline_threadpool("backend.core.album_art_scanner.run_in_threadpool") as mock_run:
 
         # _find_sourceと_process_imageのモック設定
         scanner._find_source = MagicMock(return_value=("meta", "/music/TestAlbum/track1.mp3", 100.0))
@@ -39,8 +38,7 @@ async def test_album_scanner_priority():
         
         session = AsyncMock()
         session.add = MagicMock() # .add is sync
-        existing_result = MagicMock()
-        existing_result.scalars().first.return_value = None
+        existing_result = fake_result()
         session.execute.return_value = existing_result
         
         await scanner._process_album(session, "testalbum", "TestAlbum", tracks)
@@ -57,7 +55,7 @@ async def test_album_scanner_priority():
 
 
 @pytest.mark.asyncio
-async def test_album_scanner_update_logic():
+async def test_album_scanner_update_logic(inline_threadpool, fake_result):
     """
     [Scanner] 更新ロジックのテスト
     
@@ -71,11 +69,8 @@ async def test_album_scanner_update_logic():
     scanner._find_source = MagicMock(return_value=("file", "/music/TestAlbum/cover.jpg", 200.0))
     scanner._process_image = MagicMock(return_value=b"new_data")
     
-    with patch("backend.core.album_art_scanner.run_in_threadpool", new_callable=AsyncMock) as mock_run:
-        # run_in_threadpoolのモック: 同期関数実行
-        async def run_sync_mock(func, *args):
-            return func(*args)
-        mock_run.side_effect = run_sync_mock
+    # run_in_threadpoolのモック: 同期関数実行
+    with inline_threadpool("backend.core.album_art_scanner.run_in_threadpool") as mock_run:
 
         session = AsyncMock()
         
@@ -87,8 +82,7 @@ async def test_album_scanner_update_logic():
             image_data=b"old_data"
         )
         
-        mock_result = MagicMock()
-        mock_result.scalars().first.return_value = existing_art
+        mock_result = fake_result(existing_art)
         session.execute.return_value = mock_result
         
         await scanner._process_album(session, "testalbum", "TestAlbum", [track])
@@ -4,7 +4,7 @@
 各APIエンドポイントの基本動作、バリデーション、境界値をテスト
 """
 
-from unittest.mock import AsyncMock, MagicMock
+from types import SimpleNamespace
 
 import pytest
 from fastapi import HTTPException
@@ -22,40 +22,65 @@ from backend.api.playlists import (
 )
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "endpoint, kwargs",
+    [
+        pytest.param(get_playlist, {}, id="get"),
+        pytest.param(
+            update_playlist,
+            {"update_data": PlaylistUpdate(name="New Name")},
+            id="update",
+        ),
+        pytest.param(delete_playlist, {}, id="delete"),
+        pytest.param(
+            update_playlist_tracks,
+            {"tracks_update": PlaylistTracksUpdate(track_ids=[10])},
+            id="update_tracks",
+        ),
+    ],
+)
+async def test_playlist_not_found(fake_session, endpoint, kwargs):
+    """
+    存在しないプレイリストに対する操作（エラー）
+
+    条件:
+    1. 対象プレイリストが存在しない (execute が空の結果を返す)
+
+    期待値:
+    1. 各エンドポイントが 404 を返すこと
+    2. commit されないこと
+    """
+    db = fake_session()
+    with pytest.raises(HTTPException) as exc_info:
+        await endpoint(playlist_id=999, db=db, **kwargs)
+
+    assert exc_info.value.status_code == 404
+    assert "見つかりません" in exc_info.value.detail
+    assert db.commits == 0
+
+
 class TestGetPlaylists:
     """プレイリスト一覧取得のテスト"""
 
     @pytest.mark.asyncio
-    async def test_get_playlists_empty(self):
+    async def test_get_playlists_empty(self, fake_session):
         """空のプレイリスト一覧を取得"""
-        mock_db = AsyncMock()
-        mock_result = MagicMock()
-        mock_result.scalars.return_value.unique.return_value.all.return_value = []
-        mock_db.execute.return_value = mock_result
-
-        result = await get_playlists(db=mock_db)
+        db = fake_session()
+        result = await get_playlists(db=db)
 
         assert result == []
-        mock_db.execute.assert_called_once()
+        assert db.executed == 1
 
     @pytest.mark.asyncio
-    async def test_get_playlists_with_data(self):
+    async def test_get_playlists_with_data(self, fake_session, fake_result):
         """プレイリストが存在する場合"""
-        mock_db = AsyncMock()
-
         # モックプレイリストを作成
-        mock_playlist = MagicMock()
-        mock_playlist.id = 1
-        mock_playlist.name = "Test Playlist"
-        mock_playlist.tracks = []
+        mock_playlist = SimpleNamespace(id=1, name="Test Playlist", tracks=[])
 
-        mock_result = MagicMock()
-        mock_result.scalars.return_value.unique.return_value.all.return_value = [
-            mock_playlist
-        ]
-        mock_db.execute.return_value = mock_result
+        db = fake_session(fake_result(mock_playlist))
 
-        result = await get_playlists(db=mock_db)
+        result = await get_playlists(db=db)
 
         assert len(result) == 1
         assert result[0].id == 1
@@ -67,45 +92,31 @@ class TestCreatePlaylist:
     """プレイリスト作成のテスト"""
 
     @pytest.mark.asyncio
-    async def test_create_playlist_success(self):
+    async def test_create_playlist_success(self, fake_session):
         """正常なプレイリスト作成"""
-        mock_db = AsyncMock()
-        mock_result = MagicMock()
-        mock_result.scalars.return_value.first.return_value = None  # 重複なし
-        mock_db.execute.return_value = mock_result
-        mock_db.add = MagicMock()  # Synchronous method
-        mock_db.commit = AsyncMock()
-
-        # refresh後のnew_playlist.idが設定されるようにモック
-        async def mock_refresh(obj):
-            obj.id = 1
-
-        mock_db.refresh.side_effect = mock_refresh
+        # 重複なし (execute は空の結果を返す)。id は commit 時に採番される
+        db = fake_session()
 
         playlist_data = PlaylistCreate(name="New Playlist")
-        result = await create_playlist(playlist_data=playlist_data, db=mock_db)
+        result = await create_playlist(playlist_data=playlist_data, db=db)
 
         assert result.name == "New Playlist"
         assert result.id == 1
-        mock_db.add.assert_called_once()
-        mock_db.commit.assert_called_once()
+        assert len(db.added) == 1
+        assert db.commits == 1
+        assert db.refreshed == []
 
     @pytest.mark.asyncio
-    async def test_create_playlist_duplicate_name(self):
+    async def test_create_playlist_duplicate_name(self, fake_session, fake_result):
         """重複した名前でプレイリスト作成（エラー）"""
-        mock_db = AsyncMock()
-
         # 既存のプレイリストが存在
-        mock_existing = MagicMock()
-        mock_existing.name = "Existing Playlist"
-        mock_result = MagicMock()
-        mock_result.scalars.return_value.first.return_value = mock_existing
-        mock_db.execute.return_value = mock_result
+        mock_existing = SimpleNamespace(id=2, name="Existing Playlist")
+        db = fake_session(fake_result(mock_existing))
 
         playlist_data = PlaylistCreate(name="Existing Playlist")
 
         with pytest.raises(HTTPException) as exc_info:
-            await create_playlist(playlist_data=playlist_data, db=mock_db)
+            await create_playlist(playlist_data=playlist_data, db=db)
 
         assert exc_info.value.status_code == 400
         assert "既に使用されています" in exc_info.value.detail
@@ -115,113 +126,71 @@ class TestGetPlaylist:
     """プレイリスト詳細取得のテスト"""
 
     @pytest.mark.asyncio
-    async def test_get_playlist_success(self):
+    async def test_get_playlist_success(self, fake_session, fake_result):
         """正常なプレイリスト詳細取得"""
-        mock_db = AsyncMock()
-
-        mock_track = MagicMock()
-        mock_track.id = 1
-        mock_track.track_id = 10
-        mock_track.order = 0
-        mock_track.track.title = "Track 1"
-        mock_track.track.artist = "Artist 1"
-        mock_track.track.file_name = "track1.mp3"
-        # Extended fields
-        mock_track.track.album = "Album 1"
-        mock_track.track.album_artist = "Album Artist 1"
-        mock_track.track.composer = "Composer 1"
-        mock_track.track.track_num = "1"
-        mock_track.track.duration = 180
-        mock_track.track.codec = "mp3"
-        mock_track.track.added_date = None
-        mock_track.track.last_modified = None
-
-        mock_playlist = MagicMock()
-        mock_playlist.id = 1
-        mock_playlist.name = "Test Playlist"
-        mock_playlist.tracks = [mock_track]
-
-        mock_result = MagicMock()
-        mock_result.scalars.return_value.first.return_value = mock_playlist
-        mock_db.execute.return_value = mock_result
-
-        result = await get_playlist(playlist_id=1, db=mock_db)
+        mock_track = SimpleNamespace(
+            id=1,
+            track_id=10,
+            order=0,
+            track=SimpleNamespace(
+                title="Track 1",
+                artist="Artist 1",
+                file_name="track1.mp3",
+                # Extended fields
+                album="Album 1",
+                album_artist="Album Artist 1",
+                composer="Composer 1",
+                track_num="1",
+                duration=180,
+                codec="mp3",
+                added_date=None,
+                last_modified=None,
+            ),
+        )
 
-        assert result.id == 1
-        assert result.name == "Test Playlist"
-        assert len(result.tracks) == 1
+        mock_playlist = SimpleNamespace(id=1, name="Test Playlist", tracks=[mock_track])
 
-    @pytest.mark.asyncio
-    async def test_get_playlist_not_found(self):
-        """存在しないプレイリストを取得（エラー）"""
-        mock_db = AsyncMock()
-        mock_result = MagicMock()
-        mock_result.scalars.return_value.first.return_value = None
-        mock_db.execute.return_value = mock_result
+        db = fake_session(fake_result(mock_playlist))
 
-        with pytest.raises(HTTPException) as exc_info:
-            await get_playlist(playlist_id=999, db=mock_db)
+        result = await get_playlist(playlist_id=1, db=db)
 
-        assert exc_info.value.status_code == 404
-        assert "見つかりません" in exc_info.value.detail
+        assert result.id == 1
+        assert result.name == "Test Playlist"
+        assert len(result.tracks) == 1
 
 
 class TestUpdatePlaylist:
     """プレイリスト更新のテスト"""
 
     @pytest.mark.asyncio
-    async def test_update_playlist_name_success(self):
+    async def test_update_playlist_name_success(self, fake_session, fake_result):
         """プレイリスト名の正常な更新"""
-        mock_db = AsyncMock()
-
-        mock_playlist = MagicMock()
-        mock_playlist.id = 1
-        mock_playlist.name = "Old Name"
+        mock_playlist = SimpleNamespace(id=1, name="Old Name")
 
-        # 対象プレイリスト取得
-        mock_result1 = MagicMock()
-        mock_result1.scalars.return_value.first.return_value = mock_playlist
-
-        # 重複チェック（なし）
-        mock_result2 = MagicMock()
-        mock_result2.scalars.return_value.first.return_value = None
-
-        mock_db.execute.side_effect = [mock_result1, mock_result2]
+        db = fake_session(
+            fake_result(mock_playlist),  # 対象プレイリスト取得
+            fake_result(),  # 重複チェック（なし）
+        )
 
         update_data = PlaylistUpdate(name="New Name")
-        result = await update_playlist(
-            playlist_id=1, update_data=update_data, db=mock_db
-        )
+        result = await update_playlist(playlist_id=1, update_data=update_data, db=db)
 
         assert result["status"] == "ok"
         assert mock_playlist.name == "New Name"
-        mock_db.commit.assert_called_once()
+        assert db.commits == 1
 
     @pytest.mark.asyncio
-    async def test_update_playlist_duplicate_name(self):
+    async def test_update_playlist_duplicate_name(self, fake_session, fake_result):
         """重複した名前に更新（エラー）"""
-        mock_db = AsyncMock()
-
-        mock_playlist = MagicMock()
-        mock_playlist.id = 1
-        mock_playlist.name = "Playlist 1"
-
-        mock_existing = MagicMock()
-        mock_existing.id = 2
-        mock_existing.name = "Playlist 2"
+        mock_playlist = SimpleNamespace(id=1, name="Playlist 1")
+        mock_existing = SimpleNamespace(id=2, name="Playlist 2")
 
-        mock_result1 = MagicMock()
-        mock_result1.scalars.return_value.first.return_value = mock_playlist
-
-        mock_result2 = MagicMock()
-        mock_result2.scalars.return_value.first.return_value = mock_existing
-
-        mock_db.execute.side_effect = [mock_result1, mock_result2]
+        db = fake_session(fake_result(mock_playlist), fake_result(mock_existing))
 
         update_data = PlaylistUpdate(name="Playlist 2")
 
         with pytest.raises(HTTPException) as exc_info:
-            await update_playlist(playlist_id=1, update_data=update_data, db=mock_db)
+            await update_playlist(playlist_id=1, update_data=update_data, db=db)
 
         assert exc_info.value.status_code == 400
 
@@ -230,129 +199,81 @@ class TestDeletePlaylist:
     """プレイリスト削除のテスト"""
 
     @pytest.mark.asyncio
-    async def test_delete_playlist_success(self):
+    async def test_delete_playlist_success(self, fake_session, fake_result):
         """プレイリストの正常な削除"""
-        mock_db = AsyncMock()
-
-        mock_playlist = MagicMock()
-        mock_playlist.id = 1
+        mock_playlist = SimpleNamespace(id=1)
 
-        mock_result = MagicMock()
-        mock_result.scalars.return_value.first.return_value = mock_playlist
-        mock_db.execute.return_value = mock_result
+        db = fake_session(fake_result(mock_playlist))
 
-        result = await delete_playlist(playlist_id=1, db=mock_db)
+        result = await delete_playlist(playlist_id=1, db=db)
 
         assert result["status"] == "ok"
         assert result["id"] == 1
-        mock_db.delete.assert_called_once_with(mock_playlist)
-        mock_db.commit.assert_called_once()
-
-    @pytest.mark.asyncio
-    async def test_delete_playlist_not_found(self):
-        """存在しないプレイリストを削除（エラー）"""
-        mock_db = AsyncMock()
-        mock_result = MagicMock()
-        mock_result.scalars.return_value.first.return_value = None
-        mock_db.execute.return_value = mock_result
-
-        with pytest.raises(HTTPException) as exc_info:
-            await delete_playlist(playlist_id=999, db=mock_db)
-
-        assert exc_info.value.status_code == 404
+        assert db.deleted == [mock_playlist]
+        assert db.commits == 1
 
 
 class TestUpdatePlaylistTracks:
     """プレイリスト内の曲更新のテスト"""
 
     @pytest.mark.asyncio
-    async def test_update_playlist_tracks_success(self):
+    async def test_update_playlist_tracks_success(self, fake_session, fake_result):
         """曲リストの正常な更新"""
-        mock_db = AsyncMock()
-
-        mock_playlist = MagicMock()
-        mock_playlist.id = 1
+        mock_playlist = SimpleNamespace(id=1)
 
-        mock_track1 = MagicMock()
-        mock_track1.id = 10
+        mock_track1 = SimpleNamespace(id=10)
+        mock_track2 = SimpleNamespace(id=20)
 
-        mock_track2 = MagicMock()
-        mock_track2.id = 20
-
-        # プレイリスト取得
-        mock_result1 = MagicMock()
-        mock_result1.scalars.return_value.first.return_value = mock_playlist
-
-        # トラック存在確認
-        mock_result2 = MagicMock()
-        mock_result2.scalars.return_value.all.return_value = [mock_track1, mock_track2]
-
-        # 既存のプレイリストトラック取得
-        mock_result3 = MagicMock()
-        mock_result3.scalars.return_value.all.return_value = []
-
-        mock_db.execute.side_effect = [mock_result1, mock_result2, mock_result3]
-        mock_db.add = MagicMock()  # Synchronous method
-        mock_db.commit = AsyncMock()
+        db = fake_session(
+            fake_result(mock_playlist),  # プレイリスト取得
+            fake_result(mock_track1, mock_track2),  # トラック存在確認
+            fake_result(),  # 既存のプレイリストトラック取得
+        )
 
         tracks_update = PlaylistTracksUpdate(track_ids=[10, 20])
         result = await update_playlist_tracks(
-            playlist_id=1, tracks_update=tracks_update, db=mock_db
+            playlist_id=1, tracks_update=tracks_update, db=db
         )
 
         assert result["status"] == "ok"
         assert result["track_count"] == 2
-        mock_db.commit.assert_called_once()
+        assert len(db.added) == 2
+        assert db.commits == 1
 
     @pytest.mark.asyncio
-    async def test_update_playlist_tracks_empty(self):
+    async def test_update_playlist_tracks_empty(self, fake_session, fake_result):
         """空の曲リストで更新（全削除）"""
-        mock_db = AsyncMock()
-
-        mock_playlist = MagicMock()
-        mock_playlist.id = 1
+        mock_playlist = SimpleNamespace(id=1)
 
-        mock_result1 = MagicMock()
-        mock_result1.scalars.return_value.first.return_value = mock_playlist
-
-        mock_result2 = MagicMock()
-        mock_result2.scalars.return_value.all.return_value = []
-
-        mock_db.execute.side_effect = [mock_result1, mock_result2]
+        db = fake_session(fake_result(mock_playlist), fake_result())
 
         tracks_update = PlaylistTracksUpdate(track_ids=[])
         result = await update_playlist_tracks(
-            playlist_id=1, tracks_update=tracks_update, db=mock_db
+            playlist_id=1, tracks_update=tracks_update, db=db
         )
 
         assert result["status"] == "ok"
         assert result["track_count"] == 0
 
     @pytest.mark.asyncio
-    async def test_update_playlist_tracks_invalid_track_ids(self):
+    async def test_update_playlist_tracks_invalid_track_ids(
+        self, fake_session, fake_result
+    ):
         """存在しないトラックIDを指定（エラー）"""
-        mock_db = AsyncMock()
-
-        mock_playlist = MagicMock()
-        mock_playlist.id = 1
+        mock_playlist = SimpleNamespace(id=1)
 
-        mock_track = MagicMock()
-        mock_track.id = 10
+        mock_track = SimpleNamespace(id=10)
 
-        mock_result1 = MagicMock()
-        mock_result1.scalars.return_value.first.return_value = mock_playlist
-
-        # トラック10のみ存在、20は存在しない
-        mock_result2 = MagicMock()
-        mock_result2.scalars.return_value.all.return_value = [mock_track]
-
-        mock_db.execute.side_effect = [mock_result1, mock_result2]
+        db = fake_session(
+            fake_result(mock_playlist),
+            fake_result(mock_track),  # トラック10のみ存在、20は存在しない
+        )
 
         tracks_update = PlaylistTracksUpdate(track_ids=[10, 20])
 
         with pytest.raises(HTTPException) as exc_info:
             await update_playlist_tracks(
-                playlist_id=1, tracks_update=tracks_update, db=mock_db
+                playlist_id=1, tracks_update=tracks_update, db=db
             )
 
         assert exc_info.value.status_code == 400
@@ -0,0 +1,219 @@
+import os
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from backend.core.scanner import ScannerService
+
+# Unit Test: ScannerService
+# 目的: 設定の読み込み・解析と、ファイルシステム走査時の
+#       拡張子フィルタ・除外ディレクトリ判定を検証する
+
+
+@pytest.mark.asyncio
+async def test_scanner_load_settings():
+    """
+    [Scanner] 設定の一括読み込みと事前解析
+
+    条件:
+    1. settings テーブルに scan_paths(JSON), target_exts, exclude_dirs が存在する
+    2. load_settings を実行
+
+    期待値:
+    1. SELECT が1回だけ発行されること
+    2. _get_setting で各設定値が取得できること
+    3. scan_paths/target_exts/exclude_dirs が解析済みの値として保持されること
+    """
+    mock_db = AsyncMock()
+    mock_result = MagicMock()
+    mock_result.all.return_value = [
+        ("scan_paths", '["/music", "/podcasts"]'),
+        ("target_exts", " MP3, .m4a ,"),
+        ("exclude_dirs", "Excluded, .git"),
+    ]
+    mock_db.execute.return_value = mock_result
+
+    scanner = ScannerService()
+    await scanner.load_settings(mock_db)
+
+    mock_db.execute.assert_called_once()
+    assert scanner._get_setting("target_exts") == " MP3, .m4a ,"
+    assert scanner._get_setting("missing_key", "default") == "default"
+    assert scanner.scan_paths == ["/music", "/podcasts"]
+    assert scanner.target_exts == frozenset({".mp3", ".m4a"})
+    assert scanner.exclude_dirs == frozenset({"Excluded", ".git"})
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        ('["/music"]', ["/music"]),
+        ("['/music']", ["/music"]),
+        ("/music", ["/music"]),
+        ("", []),
+    ],
+)
+def test_parse_scan_paths(raw, expected):
+    """[Scanner] scan_paths の JSON / Python リテラル / 生文字列 の解析"""
+    assert ScannerService._parse_scan_paths(raw) == expected
+
+
+def _fake_metadata(filepath):
+    """
+    _extract_metadata の代替。パスから毎回その場でメタデータを組み立てるため、
+    ファイル数が増えても side_effect のリストを事前に用意する必要がない。
+    """
+    file_name = os.path.basename(filepath).rsplit(".", 1)[0]
+    return {
+        "file_name": file_name,
+        "title": file_name.title(),
+        "artist": None,
+        "album_artist": None,
+        "composer": None,
+        "album": None,
+        "track_num": None,
+        "duration": None,
+        "codec": "mp3",
+        "size": 100,
+        "msg": None,
+    }
+
+
+@pytest.mark.asyncio
+async def test_scanner_run_scan(fake_result):
+    """
+    [Scanner] run_scan による新規ファイルの登録
+
+    条件:
+    1. DBにトラックが存在しない
+    2. ファイルシステム走査で3件の対象ファイルが見つかる
+
+    期待値:
+    1. 3件すべてのメタデータが抽出され、Trackとして追加されること
+    2. 進捗 100% が通知されること
+    3. 最後に1回だけ commit されること
+    """
+    scanner = ScannerService()
+    files = [
+        (f"/music/Album/track{i}.mp3", f"/music/Album/track{i}.mp3", 1000.0)
+        for i in range(3)
+    ]
+
+    async def _load_settings(db):
+        scanner.scan_paths = ["/music"]
+        scanner.target_exts = frozenset({".mp3"})
+
+    mock_db = AsyncMock()
+    mock_db.add = MagicMock()
+    mock_db.execute.return_value = fake_result()
+
+    mock_session_cls = MagicMock()
+    mock_session_cls.__aenter__.return_value = mock_db
+    mock_session_cls.__aexit__.return_value = None
+
+    progress_cb = MagicMock()
+
+    with (
+        patch("backend.core.scanner.AsyncSessionLocal", return_value=mock_session_cls),
+        patch("backend.core.album_art_scanner.AlbumArtScanner") as mock_art_scanner,
+        patch.object(scanner, "load_settings", side_effect=_load_settings),
+        patch.object(scanner, "_scan_filesystem", return_value=files),
+        patch.object(scanner, "_extract_metadata", side_effect=_fake_metadata),
+    ):
+        mock_art_scanner.return_value.scan_all = AsyncMock()
+        await scanner.run_scan(progress_callback=progress_cb)
+
+    added = [c.args[0] for c in mock_db.add.call_args_list]
+    assert [t.title for t in added] == ["Track0", "Track1", "Track2"]
+    progress_cb.assert_called_with(100)
+    mock_db.commit.assert_awaited_once()
+
+
+def _dir_entry(parent, name, is_dir=False, mtime=12345.0):
+    """os.scandir が返す DirEntry の代わりとなるモック"""
+    entry = MagicMock()
+    entry.name = name
+    entry.path = os.path.join(parent, name)
+    entry.is_dir.return_value = is_dir
+    entry.stat.return_value.st_mtime = mtime
+    return entry
+
+
+class _FakeScandirIterator:
+    """with文とイテレーションに対応した os.scandir の戻り値の代替"""
+
+    def __init__(self, entries):
+        self._entries = iter(entries)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __iter__(self):
+        return self._entries
+
+
+def _fake_scandir(tree):
+    """ディレクトリパス -> DirEntry一覧 の辞書から os.scandir の代替を作る"""
+
+    def _scandir(path):
+        if path not in tree:
+            raise FileNotFoundError(path)
+        return _FakeScandirIterator(tree[path])
+
+    return _scandir
+
+
+def test_scan_filesystem_logic():
+    """
+    [Scanner] 拡張子フィルタと除外ディレクトリ
+
+    条件:
+    1. 大文字/小文字の混在した拡張子、対象外拡張子、拡張子なしのファイルが存在する
+    2. 除外ディレクトリが設定されている
+    3. 存在しないスキャンパスが含まれている
+
+    期待値:
+    1. 対象拡張子のファイルのみが大文字小文字を区別せず抽出されること
+    2. 除外ディレクトリは走査されないこと
+    3. 相対パスはスキャンルートの親ディレクトリ基準になること
+    4. mtime は DirEntry.stat() の値が使われること
+    5. 存在しないスキャンパスはスキップされること
+    """
+    scanner = ScannerService()
+    root = os.path.join(os.sep, "music")
+    album = os.path.join(root, "Album")
+    excluded = os.path.join(root, "Excluded")
+    tree = {
+        root: [
+            _dir_entry(root, "Album", is_dir=True),
+            _dir_entry(root, "Excluded", is_dir=True),
+            _dir_entry(root, "a.MP3"),
+            _dir_entry(root, "b.m4a"),
+            _dir_entry(root, "c.txt"),
+            _dir_entry(root, "noext"),
+            _dir_entry(root, "d.flac.mp3"),
+        ],
+        album: [_dir_entry(album, "e.Mp3")],
+        excluded: [_dir_entry(excluded, "ignored.mp3")],
+    }
+    missing_root = os.path.join(os.sep, "missing")
+
+    with (
+        patch("backend.core.scanner.os.path.islink", return_value=False),
+        patch("backend.core.scanner.os.scandir", side_effect=_fake_scandir(tree)),
+    ):
+        results = scanner._scan_filesystem(
+            [missing_root, root],
+            frozenset({".mp3", ".m4a"}),
+            frozenset({"Excluded"}),
+        )
+
+    names = sorted(os.path.basename(full) for full, _, _ in results)
+    assert names == ["a.MP3", "b.m4a", "d.flac.mp3", "e.Mp3"]
+
+    rel_paths = {rel for _, rel, _ in results}
+    assert os.path.join(os.sep, "music", "Album", "e.Mp3") in rel_paths
+    assert all(mtime == 12345.0 for _, _, mtime in results)
@@ -1,11 +1,18 @@
+import io
 import logging
-from ftplib import error_perm
+import os
+from ftplib import error_perm, error_reply, error_temp
 from types import SimpleNamespace
 from unittest.mock import MagicMock, call, mock_open, patch
 
 import pytest
 
-from backend.core.syncer import FtpSynchronizer, RsyncSynchronizer, make_m3u8
+from backend.core.syncer import (
+    FTP_UPLOAD_BLOCKSIZE,
+    FtpSynchronizer,
+    RsyncSynchronizer,
+    make_m3u8,
+)
 
 # --- make_m3u8 Tests ---
 
@@ -106,8 +113,22 @@ class TestFtpSynchronizer:
     @pytest.fixture
     def mock_ftp(self):
         with patch("ftplib.FTP") as mock:
+            # 接続時の FEAT には MLST 対応として応答する
+            mock.return_value.sendcmd.return_value = (
+                "211-Features supported:\n MLST type*;size*;\n UTF8\n211 End FEAT."
+            )
             yield mock.return_value
 
+    @pytest.fixture
+    def local_file(self):
+        """
+        syncerモジュール内の open() のみを差し替え、BytesIOを返すFixture。
+        builtins.open 全体を mock_open で置き換えないため、他のI/Oに影響しない。
+        """
+        fp = io.BytesIO(b"audio data")
+        with patch("backend.core.syncer.open", create=True, return_value=fp):
+            yield fp
+
     def test_init_connects_to_ftp(self, settings, mock_ftp):
         """
         初期化時にFTP接続、ログイン、パッシブモード設定が行われること。
@@ -120,33 +141,129 @@ class TestFtpSynchronizer:
         mock_ftp.set_pasv.assert_called_with(True)
         assert mock_ftp.encoding == "utf-8"
 
-    def test_cp_uploads_file(self, settings, mock_ftp):
+    def test_cp_uploads_file(self, settings, mock_ftp, local_file):
         """
         cpメソッドが正しいディレクトリに移動し、ファイルをアップロードすること。
         """
         sync = FtpSynchronizer([], [], settings)
 
-        # Mock open to avoid file system access
-        with patch("builtins.open", mock_open(read_data=b"audio data")) as m_open:
-            sync.cp("/local/song.mp3", "Music/Artist/song.mp3")
+        sync.cp("/local/song.mp3", "Music/Artist/song.mp3")
+
+        # 1. Change Directory
+        # Note: The implementation might change directory step by step or directly.
+        # If the path is relative, it depends on current dir.
+        # Here we assume it tries to change to target directory.
+        # If 'Music/Artist' is passed, it might try CWD to 'Music' then 'Artist', or full path.
+        # Checking if cwd was called with expected path.
+        # Based on failure log: assert '/' == 'Music/Artist' -> seems like it resets to root first?
+        # Or maybe checking call_args_list[0] which is root reset?
+        # Let's check if 'Music/Artist' is in any of the call args.
+        cwd_calls = [c.args[0] for c in mock_ftp.cwd.call_args_list]
+        assert "Music/Artist" in cwd_calls
+
+        # 2. Upload (STOR)
+        # storbinary(cmd, fp)
+        args, kwargs = mock_ftp.storbinary.call_args
+        assert args[0] == "STOR song.mp3"
+        assert args[1] is local_file
+        assert kwargs["blocksize"] == FTP_UPLOAD_BLOCKSIZE
+
+    @pytest.mark.skipif(
+        not hasattr(os, "posix_fadvise"), reason="posix_fadvise is not available"
+    )
+    def test_cp_hints_sequential_read(self, settings, mock_ftp, tmp_path):
+        """
+        アップロード元のファイルに対して、順次読み込みのヒント(posix_fadvise)を与えること。
+        """
+        src = tmp_path / "song.mp3"
+        src.write_bytes(b"audio data")
+        sync = FtpSynchronizer([], [], settings)
 
-            # 1. Change Directory
-            # Note: The implementation might change directory step by step or directly.
-            # If the path is relative, it depends on current dir.
-            # Here we assume it tries to change to target directory.
-            # If 'Music/Artist' is passed, it might try CWD to 'Music' then 'Artist', or full path.
-            # Checking if cwd was called with expected path.
-            # Based on failure log: assert '/' == 'Music/Artist' -> seems like it resets to root first?
-            # Or maybe checking call_args_list[0] which is root reset?
-            # Let's check if 'Music/Artist' is in any of the call args.
-            cwd_calls = [c.args[0] for c in mock_ftp.cwd.call_args_list]
-            assert "Music/Artist" in cwd_calls
-
-            # 2. Upload (STOR)
-            # storbinary(cmd, fp)
-            args, _ = mock_ftp.storbinary.call_args
-            assert args[0] == "STOR song.mp3"
-            # args[1] should be the file object
+        with patch("backend.core.syncer.os.posix_fadvise") as mock_fadv:
+            sync.cp(str(src), "Music/song.mp3")
+
+        mock_fadv.assert_called_once()
+        assert mock_fadv.call_args.args[1:] == (0, 0, os.POSIX_FADV_SEQUENTIAL)
+        mock_ftp.storbinary.assert_called_once()
+
+    def test_cp_skips_cwd_for_same_directory(self, settings, mock_ftp):
+        """
+        同じディレクトリへ連続してアップロードする場合、CWDは最初の1回だけ行われ、
+        ディレクトリが変わった場合のみ再度CWDすること。
+        """
+        sync = FtpSynchronizer([], [], settings)
+        mock_ftp.cwd.reset_mock()  # Clear cwd calls from __init__
+
+        with patch(
+            "backend.core.syncer.open",
+            create=True,
+            side_effect=lambda *args: io.BytesIO(b"audio data"),
+        ):
+            sync.cp("/local/a.mp3", "Music/Artist/a.mp3")
+            sync.cp("/local/b.mp3", "Music/Artist/b.mp3")
+            assert mock_ftp.cwd.call_args_list == [call("Music/Artist")]
+
+            sync.cp("/local/c.mp3", "Music/Other/c.mp3")
+        assert mock_ftp.cwd.call_args_list == [
+            call("Music/Artist"),
+            call("/"),
+            call("Music/Other"),
+        ]
+        assert mock_ftp.storbinary.call_count == 3
+
+    def test_cp_retries_cwd_after_failure(self, settings, mock_ftp, local_file):
+        """
+        CWDに失敗した後は作業ディレクトリを不明とみなし、次回はルートから移動し直すこと。
+        """
+        sync = FtpSynchronizer([], [], settings)
+        mock_ftp.cwd.reset_mock()
+        mock_ftp.cwd.side_effect = [error_perm("550 No such directory"), None, None]
+
+        sync.cp("/local/a.mp3", "Music/Artist/a.mp3")
+        sync.cp("/local/a.mp3", "Music/Artist/a.mp3")
+
+        assert mock_ftp.cwd.call_args_list == [
+            call("Music/Artist"),
+            call("/"),
+            call("Music/Artist"),
+        ]
+        mock_ftp.storbinary.assert_called_once()
+
+    def test_put_playlist_file_uploads_from_memory(self, settings, mock_ftp):
+        """
+        プレイリストは一時ファイルを作らず、UTF-8でエンコードした内容が
+        同期先のルートへSTORされること。
+        """
+        playlists = [{"name": "お気に入り", "content": "#EXTM3U\n\n曲.mp3\n"}]
+        sync = FtpSynchronizer([], playlists, {**settings, "sync_dest": "/Music"})
+        uploaded = {}
+
+        def capture(cmd, fp, blocksize):
+            uploaded[cmd] = fp.read()
+
+        mock_ftp.storbinary.side_effect = capture
+
+        with patch("backend.core.syncer.tempfile.mkstemp") as mock_mkstemp:
+            sync.put_playlist_file()
+
+        mock_mkstemp.assert_not_called()
+        assert mock_ftp.cwd.call_args_list[-1] == call("Music")
+        assert uploaded == {
+            "STOR お気に入り.m3u": "#EXTM3U\n\n曲.mp3\n".encode("utf-8")
+        }
+
+    def test_put_playlist_file_normalizes_target(self, settings, mock_ftp):
+        """
+        relative_dir を指定した場合も、基底クラスと同じく区切り文字を正規化した
+        パスへアップロードすること。
+        """
+        playlists = [{"name": "list", "content": "#EXTM3U\n"}]
+        sync = FtpSynchronizer([], playlists, settings)
+
+        with patch.object(sync, "_upload") as mock_upload:
+            sync.put_playlist_file("Lists/")
+
+        assert mock_upload.call_args.args[0] == "Lists/list.m3u"
 
     def test_del_closes_connection(self, settings, mock_ftp):
         """
@@ -157,20 +274,19 @@ class TestFtpSynchronizer:
 
         mock_ftp.quit.assert_called_once()
 
-    def test_cp_handles_cwd_permission_error(self, settings, mock_ftp):
+    def test_cp_handles_cwd_permission_error(self, settings, mock_ftp, local_file):
         """
         cpメソッドでcwdがftplib.error_permを上げた際にクラッシュしないこと。
         """
+        sync = FtpSynchronizer([], [], settings)
+
         # Set cwd to raise an error only for the first call
         mock_ftp.cwd.side_effect = [error_perm("550 No such directory"), None]
 
-        sync = FtpSynchronizer([], [], settings)
-
-        with patch("builtins.open", mock_open(read_data=b"audio data")):
-            try:
-                sync.cp("/local/song.mp3", "Music/Artist/song.mp3")
-            except Exception as e:
-                pytest.fail(f"cp method should not crash on ftplib.error_perm: {e}")
+        try:
+            sync.cp("/local/song.mp3", "Music/Artist/song.mp3")
+        except Exception as e:
+            pytest.fail(f"cp method should not crash on ftplib.error_perm: {e}")
 
         # Ensure cwd was called
         assert mock_ftp.cwd.called
@@ -202,11 +318,21 @@ class TestFtpSynchronizer:
         """
         sync = FtpSynchronizer([], [], settings)
         mock_ftp.cwd.reset_mock()  # Clear cwd calls from __init__
+        mock_ftp.sendcmd.side_effect = error_perm("550 No such directory")  # MLST
         sync.mkdir_p_remote("Music")
         mock_ftp.mkd.assert_called_once_with("Music")
         # Ensure it changes back to root or stays as is
         assert mock_ftp.cwd.call_args_list == []  # No cwd calls in mkdir_p_remote
 
+    def test_mkdir_p_remote_mlst_temp_error(self, settings, mock_ftp):
+        """
+        MLSTが一時的なエラー(4xx)を返しても例外を送出せず、MKDで作成を続けること。
+        """
+        sync = FtpSynchronizer([], [], settings)
+        mock_ftp.sendcmd.side_effect = error_temp("450 Busy")  # MLST
+        sync.mkdir_p_remote("Music")
+        mock_ftp.mkd.assert_called_once_with("Music")
+
     def test_mkdir_p_remote_recursive(self, settings, mock_ftp):
         """
         mkdir_p_remoteが複数階層のディレクトリを再帰的に作成すること。
@@ -214,6 +340,7 @@ class TestFtpSynchronizer:
         sync = FtpSynchronizer([], [], settings)
         mock_ftp.cwd.reset_mock()  # Clear cwd calls from __init__
 
+        mock_ftp.sendcmd.side_effect = error_perm("550 No such directory")  # MLST
         # mkd will be called for each part
         mock_ftp.mkd.side_effect = [
             None,  # for Music
@@ -229,6 +356,53 @@ class TestFtpSynchronizer:
         assert mock_ftp.mkd.call_count == 3
         assert mock_ftp.cwd.call_args_list == []  # No cwd calls in mkdir_p_remote
 
+    def test_mkdir_p_remote_existing_dir(self, settings, mock_ftp):
+        """
+        末端のディレクトリがMLSTで存在確認できた場合、MKDを行わないこと。
+        同じディレクトリに対する2回目以降の呼び出しではMLSTも行わないこと。
+        """
+        sync = FtpSynchronizer([], [], settings)
+        mock_ftp.sendcmd.reset_mock()  # Clear FEAT from __init__
+        mock_ftp.sendcmd.return_value = (
+            "250-Listing Music/Artist\n type=dir;perm=el; /Music/Artist\n250 End"
+        )
+
+        sync.mkdir_p_remote("Music/Artist")
+        sync.mkdir_p_remote("Music/Artist")
+
+        mock_ftp.sendcmd.assert_called_once_with("MLST Music/Artist")
+        mock_ftp.mkd.assert_not_called()
+
+    def test_mkdir_p_remote_skips_known_parents(self, settings, mock_ftp):
+        """
+        作成済みの親ディレクトリに対しては再度MKDしないこと。
+        """
+        sync = FtpSynchronizer([], [], settings)
+        mock_ftp.sendcmd.side_effect = error_perm("550 No such directory")
+
+        sync.mkdir_p_remote("Music/A")
+        sync.mkdir_p_remote("Music/B")
+
+        assert mock_ftp.mkd.call_args_list == [
+            call("Music"),
+            call("Music/A"),
+            call("Music/B"),
+        ]
+
+    def test_mkdir_p_remote_without_mlst(self, settings, mock_ftp):
+        """
+        MLST非対応のサーバーでは、以降MLSTを送らずにMKDのみで作成すること。
+        """
+        sync = FtpSynchronizer([], [], settings)
+        mock_ftp.sendcmd.reset_mock()  # Clear FEAT from __init__
+        mock_ftp.sendcmd.side_effect = error_perm("500 Unknown command")
+
+        sync.mkdir_p_remote("A")
+        sync.mkdir_p_remote("B")
+
+        mock_ftp.sendcmd.assert_called_once_with("MLST A")
+        assert mock_ftp.mkd.call_args_list == [call("A"), call("B")]
+
     def test_ls_remote_files_and_dirs(self, settings, mock_ftp):
         """
         ls_remoteがファイルとディレクトリを正しくリストアップすること。
@@ -241,7 +415,7 @@ class TestFtpSynchronizer:
             (".", {"type": "dir"}),  # Should be ignored
             ("..", {"type": "dir"}),  # Should be ignored
         ]
-        mock_ftp.cwd.return_value = None  # cwd will be called by ls_remote
+        mock_ftp.cwd.reset_mock()  # Clear cwd calls from __init__
 
         result = sync.ls_remote("my_dir")
 
@@ -250,9 +424,122 @@ class TestFtpSynchronizer:
         assert ("subdir", True) in result
         assert ("file2.txt", False) in result
         assert len(result) == 3  # . and .. should be ignored
-        # Depending on implementation, it might CWD to root first then to my_dir
-        cwd_calls = [c.args[0] for c in mock_ftp.cwd.call_args_list]
-        assert "my_dir" in cwd_calls
+        # ルートからの相対パスで MLSD し、CWD は行わない
+        assert mock_ftp.mlsd.call_args.kwargs["path"] == "my_dir"
+        assert mock_ftp.cwd.call_args_list == []
+
+    def test_ls_remote_falls_back_to_nlst(self, settings, mock_ftp):
+        """
+        MLSDに失敗した場合、対象ディレクトリへCWDしてnlstで一覧を取得すること。
+        """
+        sync = FtpSynchronizer([], [], settings)
+        mock_ftp.cwd.reset_mock()
+        mock_ftp.mlsd.side_effect = error_perm("500 Unknown command")
+        mock_ftp.nlst.return_value = ["file1.mp3", "subdir"]
+        # my_dir への移動は成功、file1.mp3 への移動は失敗 (=ファイル)
+        mock_ftp.cwd.side_effect = [None, error_perm("550 Not a directory"), None, None]
+
+        result = sync.ls_remote("my_dir")
+
+        assert result == [("file1.mp3", False), ("subdir", True)]
+        assert mock_ftp.cwd.call_args_list == [
+            call("my_dir"),
+            call("file1.mp3"),
+            call("subdir"),
+            call(".."),
+        ]
+
+    def test_ls_remote_nlst_restores_cwd_after_failed_return(self, settings, mock_ftp):
+        """
+        nlstでのディレクトリ判定中に親ディレクトリへ戻れなかった場合、
+        対象ディレクトリへ移動し直し、作業ディレクトリの記録とずれないこと。
+        """
+        sync = FtpSynchronizer([], [], settings)
+        sync._use_mlsd = False
+        mock_ftp.nlst.return_value = ["subdir"]
+        mock_ftp.cwd.reset_mock()
+        # my_dir, subdir への移動は成功、".." への移動は失敗
+        mock_ftp.cwd.side_effect = [None, None, error_perm("550 Denied"), None, None]
+
+        result = sync.ls_remote("my_dir")
+
+        assert result == [("subdir", True)]
+        assert mock_ftp.cwd.call_args_list == [
+            call("my_dir"),
+            call("subdir"),
+            call(".."),
+            call("/"),
+            call("my_dir"),
+        ]
+        assert sync._cwd == "/my_dir"
+
+    def test_features_without_mlst(self, settings, mock_ftp):
+        """
+        FEATにMLST/MLSDが含まれないサーバーでは、MLST/MLSDを送らずに
+        MKDとnlstだけで処理すること。
+        """
+        mock_ftp.sendcmd.return_value = "211-Features:\n SIZE\n MDTM\n211 End"
+        sync = FtpSynchronizer([], [], settings)
+        mock_ftp.nlst.return_value = []
+
+        sync.mkdir_p_remote("Music")
+        sync.ls_remote("Music")
+
+        mock_ftp.sendcmd.assert_called_once_with("FEAT")
+        mock_ftp.mkd.assert_called_once_with("Music")
+        mock_ftp.mlsd.assert_not_called()
+        mock_ftp.nlst.assert_called_once()
+
+    @pytest.mark.parametrize(
+        "feat",
+        [
+            pytest.param(error_temp("421 Service not available"), id="error_temp"),
+            pytest.param(error_reply("300 Unexpected"), id="error_reply"),
+            pytest.param("211 no features", id="no_feature_list"),
+        ],
+    )
+    def test_features_unknown_keeps_probing(self, settings, mock_ftp, feat):
+        """
+        FEATが失敗した場合や機能一覧を返さない場合も接続は継続し、
+        MLST/MLSDは実際に試して判断すること。
+        """
+        if isinstance(feat, str):
+            mock_ftp.sendcmd.return_value = feat
+        else:
+            mock_ftp.sendcmd.side_effect = feat
+
+        sync = FtpSynchronizer([], [], settings)
+
+        assert sync._use_mlst is True
+        assert sync._use_mlsd is True
+
+    def test_features_mlsd_only(self, settings, mock_ftp):
+        """
+        FEATにMLSDのみが含まれる場合、MLSDは使いMLSTは使わないこと。
+        """
+        mock_ftp.sendcmd.return_value = "211-Features:\n MLSD\n211 End"
+
+        sync = FtpSynchronizer([], [], settings)
+
+        assert sync._use_mlst is False
+        assert sync._use_mlsd is True
+
+    def test_ls_remote_stops_mlsd_after_unsupported(self, settings, mock_ftp):
+        """
+        MLSDが未対応(500)で失敗した場合、以降のディレクトリではMLSDを試さないこと。
+        未対応は失敗としてログに出さないこと。
+        """
+        logs = []
+        sync = FtpSynchronizer([], [], settings, log_callback=logs.append)
+        mock_ftp.mlsd.side_effect = error_perm("500 Unknown command")
+        mock_ftp.nlst.return_value = []
+
+        sync.ls_remote("A")
+        sync.ls_remote("B")
+
+        mock_ftp.mlsd.assert_called_once()
+        assert mock_ftp.nlst.call_count == 2
+        assert not any("failed" in msg for msg in logs)
 
     def test_ls_remote_empty_dir(self, settings, mock_ftp):
         """
@@ -260,7 +547,6 @@ class TestFtpSynchronizer:
         """
         sync = FtpSynchronizer([], [], settings)
         mock_ftp.mlsd.return_value = [(".", {"type": "dir"}), ("..", {"type": "dir"})]
-        mock_ftp.cwd.return_value = None
 
         result = sync.ls_remote("empty_dir")
         assert result == []
@@ -272,13 +558,16 @@ class TestFtpSynchronizer:
         ls_remoteが存在しないディレクトリでFileNotFoundErrorを発生させること。
         """
         sync = FtpSynchronizer([], [], settings)
-        mock_ftp.cwd.side_effect = error_perm(
-            "550 No such directory"
-        )  # cwd called by ls_remote
+        mock_ftp.cwd.reset_mock()
+        mock_ftp.mlsd.side_effect = error_perm("550 No such directory")
 
         with pytest.raises(FileNotFoundError):
             sync.ls_remote("non_existent_dir")
 
+        # MLSD の 550 で確定させ、nlst の CWD による再確認は行わない
+        assert mock_ftp.cwd.call_args_list == []
+        mock_ftp.nlst.assert_not_called()
+
 
 # --- RsyncSynchronizer Tests ---
 
@@ -305,7 +594,7 @@ class TestRsyncSynchronizer:
     def mock_subprocess_popen(self):
         with patch("subprocess.Popen") as mock_popen:
             # Mock stdout to be an iterator of lines
-            mock_popen.return_value.stdout = ["line1\n", "line2\n"]
+            mock_popen.return_value.stdout = [b"line1\n", b"line2\n"]
             mock_popen.return_value.wait.return_value = 0  # Ensure wait returns 0
             mock_popen.return_value.returncode = 0
             yield mock_popen
@@ -333,9 +622,70 @@ class TestRsyncSynchronizer:
         with patch("builtins.open", m) as mock:
             yield mock
 
-    def test_synchronize_local(
+    @pytest.mark.parametrize(
+        "overrides, expected_cmd",
+        [
+            pytest.param(
+                {"rsync_host": "", "sync_dest": "/local/backup"},
+                [
+                    "rsync",
+                    "-avz",
+                    "--delete-excluded",
+                    "--include-from",
+                    "/tmp/temp_include_file",
+                    "--exclude=*",
+                    "/local/music",  # scan_pathsからのソースディレクトリ
+                    "/local/backup",  # ローカルの宛先
+                ],
+                id="local",
+            ),
+            pytest.param(
+                {},
+                [
+                    "sshpass",
+                    "-p",
+                    "secret",
+                    "rsync",
+                    "-avz",
+                    "--delete-excluded",
+                    "--include-from",
+                    "/tmp/temp_include_file",
+                    "--exclude=*",
+                    "/local/music",
+                    "-e",
+                    "ssh -p 22",  # SSH関連のオプション
+                    "rsync_user@rsync_host:/remote/path",  # リモートの宛先
+                ],
+                id="remote_ssh_password",
+            ),
+            pytest.param(
+                {
+                    "rsync_pass": "",
+                    "rsync_use_key": "1",
+                    "rsync_key_path": "/path/to/key",
+                },
+                # Key auth does NOT use sshpass
+                [
+                    "rsync",
+                    "-avz",
+                    "--delete-excluded",
+                    "--include-from",
+                    "/tmp/temp_include_file",
+                    "--exclude=*",
+                    "/local/music",
+                    "-e",
+                    "ssh -p 22 -i /path/to/key",  # SSH key option included
+                    "rsync_user@rsync_host:/remote/path",
+                ],
+                id="remote_ssh_key",
+            ),
+        ],
+    )
+    def test_synchronize_command(
         self,
         settings,
+        overrides,
+        expected_cmd,
         mock_subprocess_popen,
         mock_tempfile,
         mock_os_funcs,
@@ -343,32 +693,19 @@ class TestRsyncSynchronizer:
         mock_open_for_include_list,
     ):
         """
-        ローカルパスへのrsync同期で正しいコマンドが生成・実行されること。
+        ローカル / リモートSSH(パスワード認証) / リモートSSH(鍵認証) の各設定で、
+        正しいrsyncコマンドが生成・実行されること。
         """
-        settings["rsync_host"] = ""  # Local sync
-        settings["sync_dest"] = "/local/backup"
-
+        settings.update(overrides)
         mock_json_loads.return_value = ["/local/music"]
 
         tracks = [SimpleNamespace(sync=True, relative_path="/Album/Song.mp3")]
 
-        sync = RsyncSynchronizer(tracks, [], settings)
-        sync.synchronize()
+        with patch("os.path.exists", return_value=True):  # Key file exists
+            sync = RsyncSynchronizer(tracks, [], settings)
+            sync.synchronize()
 
         actual_cmd = mock_subprocess_popen.call_args[0][0]
-
-        # 期待されるrsyncコマンドの完全なリスト
-        expected_cmd = [
-            "rsync",
-            "-avz",
-            "--delete-excluded",
-            "--include-from",
-            "/tmp/temp_include_file",
-            "--exclude=*",
-            "/local/music",  # scan_pathsからのソースディレクトリ
-            "/local/backup",  # ローカルの宛先
-        ]
-
         assert actual_cmd == expected_cmd  # 完全一致を検証
 
         # Check include file content
@@ -376,10 +713,11 @@ class TestRsyncSynchronizer:
             "/tmp/temp_include_file", "w"
         )
         handle = mock_open_for_include_list()
-        handle.write.assert_any_call("/Album/Song.mp3\n")
-        handle.write.assert_any_call("/Album/\n")
+        written_lines = handle.write.call_args.args[0].splitlines()
+        assert "/Album/Song.mp3" in written_lines
+        assert "/Album/" in written_lines
 
-    def test_synchronize_remote_ssh_password(
+    def test_synchronize_logs_rsync_output(
         self,
         settings,
         mock_subprocess_popen,
@@ -389,79 +727,23 @@ class TestRsyncSynchronizer:
         mock_open_for_include_list,
     ):
         """
-        リモートSSH経由でのrsync同期（パスワード認証）で正しいコマンドが生成・実行されること。
+        rsyncの出力のうちファイルの行だけがログに出力されること。
+        UTF-8として不正なバイト列が含まれていても処理が継続すること。
         """
         mock_json_loads.return_value = ["/local/music"]
-
-        tracks = [SimpleNamespace(sync=True, relative_path="/Album/Song.mp3")]
-
-        sync = RsyncSynchronizer(tracks, [], settings)
-        sync.synchronize()
-
-        actual_cmd = mock_subprocess_popen.call_args[0][0]
-
-        # 期待されるrsyncコマンドの完全なリスト
-        expected_cmd = [
-            "sshpass",
-            "-p",
-            "secret",
-            "rsync",
-            "-avz",
-            "--delete-excluded",
-            "--include-from",
-            "/tmp/temp_include_file",
-            "--exclude=*",
-            "/local/music",  # scan_pathsからのソースディレクトリ
-            "-e",
-            "ssh -p 22",  # SSH関連のオプション
-            "rsync_user@rsync_host:/remote/path",  # リモートの宛先
+        mock_subprocess_popen.return_value.stdout = [
+            b"Album/\n",
+            "Album/曲.mp3\n".encode(),
+            b"Album/\xff.mp3\n",
         ]
+        logs = []
+        sync = RsyncSynchronizer([], [], settings, log_callback=logs.append)
 
-        assert actual_cmd == expected_cmd  # 完全一致を検証
-
-    def test_synchronize_remote_ssh_key(
-        self,
-        settings,
-        mock_subprocess_popen,
-        mock_tempfile,
-        mock_os_funcs,
-        mock_json_loads,
-        mock_open_for_include_list,
-    ):
-        """
-        リモートSSH経由でのrsync同期（鍵認証）で正しいコマンドが生成・実行されること。
-        """
-        mock_json_loads.return_value = ["/local/music"]
-
-        # Switch to key auth
-        settings["rsync_pass"] = ""
-        settings["rsync_use_key"] = "1"
-        settings["rsync_key_path"] = "/path/to/key"
-
-        with patch("os.path.exists", return_value=True):  # Key file exists
-            tracks = [SimpleNamespace(sync=True, relative_path="/Album/Song.mp3")]
-
-            sync = RsyncSynchronizer(tracks, [], settings)
-            sync.synchronize()
-
-            actual_cmd = mock_subprocess_popen.call_args[0][0]
-
-            # 期待されるrsyncコマンドの完全なリスト
-            # Key auth does NOT use sshpass
-            expected_cmd = [
-                "rsync",
-                "-avz",
-                "--delete-excluded",
-                "--include-from",
-                "/tmp/temp_include_file",
-                "--exclude=*",
-                "/local/music",
-                "-e",
-                "ssh -p 22 -i /path/to/key",  # SSH key option included
-                "rsync_user@rsync_host:/remote/path",
-            ]
+        sync.synchronize()
 
-            assert actual_cmd == expected_cmd
+        assert "Album/" not in logs
+        assert "Album/曲.mp3" in logs
+        assert "Album/\ufffd.mp3" in logs
 
     def test_cp_local_file(self, settings, mock_subprocess_run, caplog):
         """
@@ -501,6 +783,32 @@ class TestRsyncSynchronizer:
         actual_cmd = mock_subprocess_run.call_args[0][0]
         assert actual_cmd == expected_cmd
 
+    def test_ssh_key_existence_checked_once(self, settings, mock_subprocess_run):
+        """
+        SSH鍵ファイルの存在確認は初期化時の1回だけで、cpの呼び出しごとには行わないこと。
+        """
+        settings.update({"rsync_use_key": "1", "rsync_key_path": "/path/to/key"})
+
+        with patch("os.path.exists", return_value=True) as mock_exists:
+            sync = RsyncSynchronizer([], [], settings)
+            sync.cp("/local/a.mp3", "a.mp3")
+            sync.cp("/local/b.mp3", "b.mp3")
+
+        mock_exists.assert_called_once_with("/path/to/key")
+        assert mock_subprocess_run.call_count == 2
+
+    def test_cp_skips_when_ssh_key_missing(self, settings, mock_subprocess_run):
+        """
+        SSH鍵ファイルが存在しない場合、cpはrsyncを実行しないこと。
+        """
+        settings.update({"rsync_use_key": "1", "rsync_key_path": "/missing/key"})
+
+        with patch("os.path.exists", return_value=False):
+            sync = RsyncSynchronizer([], [], settings)
+        sync.cp("/local/a.mp3", "a.mp3")
+
+        mock_subprocess_run.assert_not_called()
+
     def test_cp_failure_logs_error(self, settings, mock_subprocess_run, caplog):
         """
         cpメソッドでrsyncが失敗した場合にエラーがログに出力されること。
@@ -571,8 +879,9 @@ class TestRsyncSynchronizer:
         # Verify the file was opened for writing at the correct path
         m_open.assert_called_once_with("/tmp/temp_include_file", "w")
 
-        # Get the written content
+        # Get the written content (written in a single call)
         handle = m_open()
+        handle.write.assert_called_once()
         written_content = "".join(
             call_arg.args[0] for call_arg in handle.write.call_args_list
         )
@@ -860,6 +1169,44 @@ class TestAudioSynchronizer:
         # mkdir_p_remoteが親ディレクトリで呼ばれる
         sync._mkdir_p_remote_mock.assert_called_once_with("Artist/Album")
 
+    def test_synchronize_groups_copies_by_directory(self, mock_synchronizer_class):
+        """
+        同じディレクトリへのコピーはまとめて行われ、mkdir_p_remoteは
+        ディレクトリごとに1回だけ呼ばれること。
+        """
+        tracks = [
+            SimpleNamespace(
+                sync=True,
+                file_path=f"/local/{name}",
+                file_name=name,
+                relative_path=f"/{album}/{name}",
+            )
+            for album, name in [
+                ("A", "1.mp3"),
+                ("B", "1.mp3"),
+                ("A", "2.mp3"),
+                ("B", "2.mp3"),
+            ]
+        ]
+
+        sync = mock_synchronizer_class(tracks, [], {})
+        sync._ls_remote_mock.return_value = []
+
+        manager = MagicMock()
+        manager.attach_mock(sync._mkdir_p_remote_mock, "mkdir")
+        manager.attach_mock(sync._cp_mock, "cp")
+
+        sync.synchronize()
+
+        assert manager.mock_calls == [
+            call.mkdir("A"),
+            call.cp("/local/1.mp3", "A/1.mp3"),
+            call.cp("/local/2.mp3", "A/2.mp3"),
+            call.mkdir("B"),
+            call.cp("/local/1.mp3", "B/1.mp3"),
+            call.cp("/local/2.mp3", "B/2.mp3"),
+        ]
+
     def test_synchronize_put_playlist(self, mock_synchronizer_class):
         """
         synchronize終了後にput_playlist_fileが呼ばれること。